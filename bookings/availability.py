@@ -0,0 +1,70 @@
+import datetime
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from .models import Occupancy
+
+MAX_DAYS = 366
+
+MAX_ROOMS = 100
+
+
+def parse_window(request):
+    """Read the start and end dates of the requested window, inclusive."""
+    today = timezone.localtime(timezone.now()).date()
+    try:
+        start = request.query_params.get("start")
+        start = datetime.date.fromisoformat(start) if start else today
+        end = request.query_params.get("end")
+        end = (
+            datetime.date.fromisoformat(end)
+            if end
+            else start + datetime.timedelta(days=30)
+        )
+    except ValueError:
+        raise ParseError("start and end should be YYYY-MM-DD dates.")
+    if end < start:
+        raise ParseError("end should not be before start.")
+    if (end - start).days >= MAX_DAYS:
+        raise ParseError(f"The window can't be longer than {MAX_DAYS} days.")
+    return start, end
+
+
+def get_booked_intervals(room_pks, start, end):
+    """Booked (check_in, check_out) pairs of each room touching the window"""
+    intervals = {pk: [] for pk in room_pks}
+    bookings = (
+        Occupancy.objects.filter(
+            room__in=room_pks,
+            date__gte=start,
+            date__lte=end,
+        )
+        .order_by("room", "booking__check_in")
+        .values_list("room_id", "booking__check_in", "booking__check_out")
+        .distinct()
+    )
+    for room_pk, check_in, check_out in bookings:
+        intervals[room_pk].append((check_in, check_out))
+    return intervals
+
+
+def make_bitmap(intervals, start, end):
+    """One character per day of the window, "1" when the day is booked."""
+    days = (end - start).days + 1
+    bitmap = ["0"] * days
+    for check_in, check_out in intervals:
+        first = max((check_in - start).days, 0)
+        last = min((check_out - start).days, days - 1)
+        for day in range(first, last + 1):
+            bitmap[day] = "1"
+    return "".join(bitmap)
+
+
+def get_availability(room_pks, start, end):
+    intervals = get_booked_intervals(room_pks, start, end)
+    return {
+        pk: {
+            "bitmap": make_bitmap(booked, start, end),
+            "booked": booked,
+        }
+        for pk, booked in intervals.items()
+    }
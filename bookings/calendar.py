@@ -0,0 +1,114 @@
+import datetime
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from .models import Booking, Occupancy
+
+MAX_MONTHS = 12
+
+
+def add_months(date, months):
+    month = date.month - 1 + months
+    return datetime.date(date.year + month // 12, month % 12 + 1, 1)
+
+
+def parse_months(request):
+    """First day of the requested month and of the one after the range.
+
+    year and month default to the current month and are moved forward to
+    it when they are in the past, months (1 by default) widens the range.
+    """
+    today = timezone.localtime(timezone.now()).date()
+    this_month = today.replace(day=1)
+    try:
+        start = datetime.date(
+            int(request.query_params.get("year", today.year)),
+            int(request.query_params.get("month", today.month)),
+            1,
+        )
+    except ValueError:
+        start = this_month
+    start = max(start, this_month)
+    try:
+        months = int(request.query_params.get("months", 1))
+    except ValueError:
+        raise ParseError("months should be a number.")
+    if not 1 <= months <= MAX_MONTHS:
+        raise ParseError(f"months should be between 1 and {MAX_MONTHS}.")
+    try:
+        return start, add_months(start, months)
+    except ValueError:
+        raise ParseError("That range goes past the last supported date.")
+
+
+def get_days(booking):
+    """The dates a booking takes, check out day included like overlaps."""
+    if booking.kind == Booking.BookingKindChoices.ROOM:
+        if booking.check_in is None or booking.check_out is None:
+            return []
+        return [
+            booking.check_in + datetime.timedelta(days=day)
+            for day in range((booking.check_out - booking.check_in).days + 1)
+        ]
+    if booking.experience_time is None:
+        return []
+    return [timezone.localtime(booking.experience_time).date()]
+
+
+def occupy(booking):
+    """Replace the occupancy rows of a booking, inside its transaction.
+
+    Raises ValidationError when another booking already has one of them.
+    """
+    Occupancy.objects.filter(booking=booking).delete()
+    target = {}
+    if booking.kind == Booking.BookingKindChoices.ROOM:
+        target["room_id"] = booking.room_id
+    else:
+        target["experience_id"] = booking.experience_id
+    if not any(target.values()):
+        return
+    try:
+        with transaction.atomic():
+            Occupancy.objects.bulk_create(
+                Occupancy(booking=booking, date=date, guests=booking.guests, **target)
+                for date in get_days(booking)
+            )
+    except IntegrityError:
+        raise ValidationError("Those of dates are already taken.")
+
+
+def get_occupancy(start, end, **target):
+    """Occupancy rows of a room or experience in [start, end)."""
+    return Occupancy.objects.filter(
+        date__gte=start,
+        date__lt=end,
+        **target,
+    )
+
+
+def is_booked(room, check_in, check_out):
+    """Whether any day from check_in to check_out, inclusive, is taken."""
+    return Occupancy.objects.filter(
+        room=room,
+        date__gte=check_in,
+        date__lte=check_out,
+    ).exists()
+
+
+def get_booking_pks(start, end, **target):
+    return (
+        get_occupancy(start, end, **target).order_by().values("booking_id").distinct()
+    )
+
+
+def get_calendar(start, end, **target):
+    """Booked days in [start, end) with their bookings and guests."""
+    return list(
+        get_occupancy(start, end, **target)
+        .order_by("date")
+        .values("date")
+        .annotate(bookings=Count("pk"), guests=Sum("guests"))
+    )
@@ -0,0 +1,20 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0002_alter_booking_experience_alter_booking_room_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["room", "kind", "check_in", "check_out"],
+                name="booking_room_range_idx",
+            ),
+        ),
+    ]
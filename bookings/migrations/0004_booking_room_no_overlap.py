@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        "ALTER TABLE bookings_booking "
+        "ADD CONSTRAINT booking_room_no_overlap "
+        "EXCLUDE USING gist ("
+        "room_id WITH =, "
+        "daterange(check_in, check_out, '[]') WITH &&"
+        ") WHERE ("
+        "kind = 'room' AND room_id IS NOT NULL "
+        "AND check_in IS NOT NULL AND check_out IS NOT NULL"
+        ")"
+    )
+
+
+def remove_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "ALTER TABLE bookings_booking "
+        "DROP CONSTRAINT IF EXISTS booking_room_no_overlap"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0003_booking_booking_room_range_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            add_exclusion_constraint,
+            remove_exclusion_constraint,
+        ),
+    ]
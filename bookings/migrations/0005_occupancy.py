@@ -0,0 +1,74 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0009_room_room_city_price_idx_room_room_country_price_idx"),
+        ("experiences", "0005_experience_experience_created_idx"),
+        ("bookings", "0004_booking_room_no_overlap"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Occupancy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("guests", models.PositiveIntegerField()),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occupancy",
+                        to="bookings.booking",
+                    ),
+                ),
+                (
+                    "experience",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="experiences.experience",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="rooms.room",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="occupancy",
+            index=models.Index(
+                fields=["experience", "date"], name="occupancy_experience_date_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="occupancy",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("room__isnull", False)),
+                fields=("room", "date"),
+                name="occupancy_room_date_unique",
+            ),
+        ),
+    ]
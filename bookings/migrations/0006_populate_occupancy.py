@@ -0,0 +1,44 @@
+import datetime
+from django.db import migrations
+from django.utils import timezone
+
+
+def populate_occupancy(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    Occupancy = apps.get_model("bookings", "Occupancy")
+    rows = []
+    for booking in Booking.objects.iterator():
+        if booking.kind == "room":
+            if not (booking.room_id and booking.check_in and booking.check_out):
+                continue
+            rows += [
+                Occupancy(
+                    booking=booking,
+                    room_id=booking.room_id,
+                    date=booking.check_in + datetime.timedelta(days=day),
+                    guests=booking.guests,
+                )
+                for day in range((booking.check_out - booking.check_in).days + 1)
+            ]
+        elif booking.experience_id and booking.experience_time:
+            rows.append(
+                Occupancy(
+                    booking=booking,
+                    experience_id=booking.experience_id,
+                    date=timezone.localtime(booking.experience_time).date(),
+                    guests=booking.guests,
+                )
+            )
+    # Overlaps from before the exclusion constraint keep their first booking
+    Occupancy.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_occupancy"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_occupancy, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 from common.models import CommonModel
 
@@ -47,5 +49,82 @@ class Booking(CommonModel):
     )
     guests = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "kind", "check_in", "check_out"],
+                name="booking_room_range_idx",
+            ),
+        ]
+
+    def clean(self):
+        if (
+            self.kind != Booking.BookingKindChoices.ROOM
+            or self.check_in is None
+            or self.check_out is None
+        ):
+            return
+        if self.check_out <= self.check_in:
+            raise ValidationError("Check in should be smaller than check out.")
+        if (self.check_out - self.check_in).days > settings.MAX_STAY_NIGHTS:
+            raise ValidationError(
+                f"A stay can be at most {settings.MAX_STAY_NIGHTS} nights."
+            )
+        if (
+            Occupancy.objects.filter(
+                room=self.room_id,
+                date__gte=self.check_in,
+                date__lte=self.check_out,
+            )
+            .exclude(booking=self.pk)
+            .exists()
+        ):
+            raise ValidationError("Those of dates are already taken.")
+
     def __str__(self) -> str:
         return f"{self.kind.title()} booking for: {self.user}"
+
+
+class Occupancy(models.Model):
+
+    """One day taken by a booking, kept in sync by bookings.calendar"""
+
+    booking = models.ForeignKey(
+        "bookings.Booking",
+        on_delete=models.CASCADE,
+        related_name="occupancy",
+    )
+    room = models.ForeignKey(
+        "rooms.Room",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    experience = models.ForeignKey(
+        "experiences.Experience",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    date = models.DateField()
+    guests = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "date"],
+                condition=models.Q(room__isnull=False),
+                name="occupancy_room_date_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["experience", "date"],
+                name="occupancy_experience_date_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date} / {self.booking}"
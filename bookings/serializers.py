@@ -1,8 +1,13 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
+from .calendar import is_booked
 from .models import Booking
 from users.serializers import TinyUserSerializer
 from rooms.serializers import RoomListSerializer
+from experiences.slots import SoldOut
 
 
 class CreateRoomBookingSerializer(serializers.ModelSerializer):
@@ -36,16 +41,23 @@ class CreateRoomBookingSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Check in should be smaller than check out."
             )
-        if Booking.objects.filter(
-            room=room,
-            check_in__lte=data["check_out"],
-            check_out__gte=data["check_in"],
-        ).exists():
+        if (data["check_out"] - data["check_in"]).days > settings.MAX_STAY_NIGHTS:
+            raise serializers.ValidationError(
+                f"A stay can be at most {settings.MAX_STAY_NIGHTS} nights."
+            )
+        if is_booked(room, data["check_in"], data["check_out"]):
             raise serializers.ValidationError(
                 "Those of dates are already taken."
             )
         return data
 
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except ValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
 
 class PublicBookingSerializer(serializers.ModelSerializer):
 
@@ -63,6 +75,7 @@ class PublicBookingSerializer(serializers.ModelSerializer):
             "experience_time",
             "guests",
         )
+        row_sources = {"user": "user__username", "room": "room__name"}
 
 
 class CreateExperienceBookingSerializer(serializers.ModelSerializer):
@@ -82,8 +95,13 @@ class CreateExperienceBookingSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Experience time have to be same with the experience start of time"
             )
-        if experience.bookings.filter(experience_time=value).exists():
+        return value
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except SoldOut:
             raise serializers.ValidationError(
-                "that experience is already taken"
+                "Not enough seats left for that experience"
             )
-        return value
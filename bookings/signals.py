@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .calendar import occupy
+from experiences.slots import SoldOut, release, reserve
+from .models import Booking
+
+
+def get_seats(booking):
+    """(experience pk, session, guests) a booking holds, None for rooms."""
+    if (
+        booking.kind == Booking.BookingKindChoices.EXPERIENCE
+        and booking.experience_id
+        and booking.experience_time
+    ):
+        return (
+            booking.experience_id,
+            booking.experience_time,
+            booking.guests,
+        )
+    return None
+
+
+@receiver(pre_save, sender=Booking)
+def reserve_seats(sender, instance, raw, **kwargs):
+    """Move the seats of a booking to its new session before it is saved.
+
+    Raises SoldOut, and leaves the old seats taken, when the new session
+    doesn't have enough of them.
+    """
+    if raw:
+        return
+    old = None
+    if instance.pk is not None:
+        saved = Booking.objects.filter(pk=instance.pk).first()
+        if saved is not None:
+            old = get_seats(saved)
+    new = get_seats(instance)
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            release(*old)
+        if new is not None and not reserve(
+            instance.experience, instance.experience_time, instance.guests
+        ):
+            raise SoldOut
+
+
+@receiver(post_save, sender=Booking)
+def update_occupancy(sender, instance, **kwargs):
+    occupy(instance)
+
+
+@receiver(post_delete, sender=Booking)
+def release_seats(sender, instance, **kwargs):
+    seats = get_seats(instance)
+    if seats is not None:
+        release(*seats)
@@ -1,3 +1,235 @@
-from django.test import TestCase
+import datetime
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rooms.models import Room
+from users.models import User
+from .models import Booking, Occupancy
 
-# Create your tests here.
+
+class TestRoomBookings(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.client.force_login(self.user)
+        self.today = timezone.localtime(timezone.now()).date()
+
+    def book(self, start, end):
+        return self.client.post(
+            f"/api/v1/rooms/{self.room.pk}/bookings",
+            data={
+                "check_in": self.today + datetime.timedelta(days=start),
+                "check_out": self.today + datetime.timedelta(days=end),
+                "guests": 1,
+            },
+        )
+
+    def test_overlapping_booking_is_rejected(self):
+
+        response = self.book(1, 3)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+
+        response = self.book(2, 5)
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+        response = self.book(4, 6)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+
+        self.assertEqual(
+            Booking.objects.filter(room=self.room).count(),
+            2,
+        )
+
+    def test_stays_have_a_maximum_length(self):
+
+        with self.settings(MAX_STAY_NIGHTS=5):
+            response = self.book(1, 7)
+            self.assertEqual(response.status_code, 400, "status code is not 400")
+            response = self.book(1, 6)
+            self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertEqual(Occupancy.objects.count(), 6)
+
+    def test_check(self):
+
+        self.book(1, 3)
+
+        response = self.client.get(
+            f"/api/v1/rooms/{self.room.pk}/bookings/check",
+            data={
+                "check_in": self.today + datetime.timedelta(days=3),
+                "check_out": self.today + datetime.timedelta(days=4),
+            },
+        )
+        self.assertEqual(response.json(), {"ok": False})
+
+        response = self.client.get(f"/api/v1/rooms/{self.room.pk}/bookings/check")
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+
+class TestRoomAvailability(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.rooms = [
+            Room.objects.create(
+                name=f"Room {number}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                address="Address",
+                kind=Room.RoomKindChocies.ENTIRE_PLACE,
+                owner=self.user,
+            )
+            for number in range(2)
+        ]
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.rooms[0],
+            check_in=datetime.date(2030, 1, 2),
+            check_out=datetime.date(2030, 1, 4),
+            guests=1,
+        )
+
+    def test_room_bitmap(self):
+
+        response = self.client.get(
+            f"/api/v1/rooms/{self.rooms[0].pk}/availability",
+            data={"start": "2030-01-01", "end": "2030-01-07"},
+        )
+        data = response.json()
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertEqual(data["bitmap"], "0111000")
+        self.assertEqual(data["booked"], [["2030-01-02", "2030-01-04"]])
+
+    def test_many_rooms(self):
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/v1/rooms/availability",
+                data={
+                    "rooms": ",".join(str(room.pk) for room in self.rooms),
+                    "start": "2030-01-03",
+                    "end": "2030-01-05",
+                },
+            )
+        data = response.json()["rooms"]
+
+        self.assertEqual(data[str(self.rooms[0].pk)]["bitmap"], "110")
+        self.assertEqual(data[str(self.rooms[1].pk)]["bitmap"], "000")
+
+    def test_invalid_window(self):
+
+        response = self.client.get(
+            f"/api/v1/rooms/{self.rooms[0].pk}/availability",
+            data={"start": "2030-01-07", "end": "2030-01-01"},
+        )
+
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+
+class TestCalendar(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        self.guest = User.objects.create(username="guest")
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.owner,
+        )
+        self.year = timezone.localtime(timezone.now()).year + 1
+        self.booking = Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.guest,
+            room=self.room,
+            check_in=datetime.date(self.year, 1, 30),
+            check_out=datetime.date(self.year, 2, 2),
+            guests=2,
+        )
+
+    def get_calendar(self, **params):
+        return self.client.get(
+            f"/api/v1/rooms/{self.room.pk}/calendar",
+            data={"year": self.year, **params},
+        ).json()
+
+    def test_months(self):
+        january = self.get_calendar(month=1)
+        self.assertEqual(january["end"], f"{self.year}-01-31")
+        self.assertEqual(
+            [day["date"] for day in january["days"]],
+            [f"{self.year}-01-30", f"{self.year}-01-31"],
+        )
+        self.assertNotIn("guests", january["days"][0])
+
+        self.client.force_login(self.owner)
+        with self.assertNumQueries(4):
+            data = self.get_calendar(month=12, months=3)
+        self.assertEqual(data["start"], f"{self.year}-12-01")
+        self.assertEqual(
+            data["end"],
+            str(datetime.date(self.year + 1, 3, 1) - datetime.timedelta(1)),
+        )
+
+        data = self.get_calendar(month=1, months=2)
+        self.assertEqual(len(data["days"]), 4)
+        self.assertEqual(data["days"][0]["guests"], 2)
+
+    def test_range_past_the_last_date(self):
+        response = self.client.get(
+            f"/api/v1/rooms/{self.room.pk}/calendar",
+            data={"year": 9999, "month": 12},
+        )
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+    def test_bookings_follow_the_occupancy(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(
+            f"/api/v1/rooms/{self.room.pk}/bookings",
+            data={"year": self.year, "month": 2},
+        )
+        self.assertEqual(
+            [booking["pk"] for booking in response.json()],
+            [self.booking.pk],
+        )
+        self.booking.check_out = datetime.date(self.year, 1, 31)
+        self.booking.save()
+        response = self.client.get(
+            f"/api/v1/rooms/{self.room.pk}/bookings",
+            data={"year": self.year, "month": 2},
+        )
+        self.assertEqual(response.json(), [])
+        self.booking.delete()
+        self.assertFalse(Occupancy.objects.exists())
+
+    def test_days_can_only_be_taken_once(self):
+        booking = Booking(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.guest,
+            room=self.room,
+            check_in=datetime.date(self.year, 2, 2),
+            check_out=datetime.date(self.year, 2, 5),
+            guests=1,
+        )
+        with self.assertRaises(ValidationError):
+            booking.full_clean()
+        with self.assertRaises(ValidationError), transaction.atomic():
+            booking.save()
+        self.booking.full_clean()
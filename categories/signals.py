@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from common.cache import invalidate_namespace
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    invalidate_namespace("categories")
+    invalidate_namespace("rooms")
+    invalidate_namespace("experiences")
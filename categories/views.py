@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_204_NO_CONTENT
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
+from common.cache import cached
 from .models import Category
 from .serializers import CategorySerializer
 
@@ -11,3 +12,10 @@ class CategoryViewSet(ModelViewSet):
 
     serializer_class = CategorySerializer
     queryset = Category.objects.filter(kind=Category.CategoryKindChoices.ROOMS)
+
+    def list(self, request, *args, **kwargs):
+        data = cached(
+            lambda: self.get_serializer(self.get_queryset(), many=True).data,
+            "categories",
+        )
+        return Response(data)
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(namespace):
+    return cache.get_or_set(f"{namespace}:version", time.time_ns, None)
+
+
+def make_key(namespace, *parts):
+    return ":".join(str(part) for part in (namespace, get_version(namespace), *parts))
+
+
+def cached(build, namespace, *parts):
+    """Return the cached data for the key or build and store it."""
+    key = make_key(namespace, *parts)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.API_CACHE_TIMEOUT)
+    return data
+
+
+def now_and_on_commit(action):
+    """Run action now and, inside a transaction, again once it commits.
+
+    Until the commit other connections still read the old rows and can
+    put them back in the cache, the second run drops that copy.
+    """
+    action()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(action)
+
+
+def invalidate(namespace, *parts):
+    now_and_on_commit(lambda: cache.delete(make_key(namespace, *parts)))
+
+
+def invalidate_namespace(namespace):
+    now_and_on_commit(lambda: cache.set(f"{namespace}:version", time.time_ns(), None))
+
+
+class LocalCache:
+
+    """Small per-process LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete_matching(self, predicate):
+        with self.lock:
+            for key, (value, expires) in list(self.entries.items()):
+                if predicate(value):
+                    del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
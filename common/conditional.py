@@ -0,0 +1,84 @@
+import hashlib
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class Stamp:
+
+    """Validators for a response, computed before it is serialized"""
+
+    def __init__(self, last_modified, *parts):
+        self.last_modified = last_modified
+        digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False)
+        self.etag = quote_etag(digest.hexdigest())
+
+    def not_modified(self, request):
+        """The 304 (or 412) response when the client's copy is current."""
+        response = get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=self.timestamp(),
+        )
+        if response is not None and response.status_code == 304:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(self.timestamp())
+        return response
+
+    def timestamp(self):
+        if self.last_modified is None:
+            return None
+        return int(self.last_modified.timestamp())
+
+
+def related_annotations(name, queryset, field):
+    """Newest updated_at and size of the rows of queryset per outer pk."""
+    grouped = queryset.filter(**{field: OuterRef("pk")}).order_by().values(field)
+    return {
+        f"{name}_updated_at": Subquery(
+            grouped.annotate(latest=Max("updated_at")).values("latest")
+        ),
+        f"{name}_count": Coalesce(
+            Subquery(grouped.annotate(total=Count("pk")).values("total")),
+            0,
+        ),
+    }
+
+
+def get_stamp(queryset, fields, related=None, extra=()):
+    """Stamp for the one row of queryset in a single query, or None.
+
+    fields are the columns the representation depends on, related maps a
+    name to (queryset, field) for the nested rows, and extra holds anything
+    per request, like who is asking. Last-Modified is only sent when the
+    row itself has updated_at.
+    """
+    annotations = {}
+    for name, (related_queryset, field) in (related or {}).items():
+        annotations.update(related_annotations(name, related_queryset, field))
+    row = queryset.annotate(**annotations).values(*fields, *annotations).first()
+    if row is None:
+        return None
+    last_modified = None
+    if "updated_at" in row:
+        last_modified = max(
+            value
+            for key, value in row.items()
+            if key.endswith("updated_at") and value is not None
+        )
+    return Stamp(last_modified, sorted(row.items()), *extra)
+
+
+def get_list_stamp(queryset, extra=()):
+    """Stamp for a whole list: newest updated_at and row count."""
+    stamp = queryset.order_by().aggregate(
+        latest=Max("updated_at"),
+        total=Count("pk"),
+    )
+    return Stamp(stamp["latest"], stamp["latest"], stamp["total"], *extra)
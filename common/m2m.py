@@ -0,0 +1,25 @@
+from django.db import transaction
+
+
+def sync_m2m(manager, pks, error):
+    """Make a many to many manager hold exactly the given pks.
+
+    The pks are checked with one query and only the difference against the
+    current rows is removed and added, through the manager so that
+    m2m_changed still fires. Raises error if any pk doesn't exist.
+    """
+    if not isinstance(pks, (list, tuple)):
+        raise error
+    try:
+        pks = {int(pk) for pk in pks}
+    except (TypeError, ValueError):
+        raise error
+    found = set(manager.model.objects.filter(pk__in=pks).values_list("pk", flat=True))
+    if found != pks:
+        raise error
+    current = set(manager.values_list("pk", flat=True))
+    with transaction.atomic():
+        if current - pks:
+            manager.remove(*(current - pks))
+        if pks - current:
+            manager.add(*(pks - current))
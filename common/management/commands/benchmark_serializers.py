@@ -0,0 +1,135 @@
+import datetime
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from bookings.models import Booking
+from bookings.serializers import PublicBookingSerializer
+from common.fast_serializers import fast_data
+from experiences.models import Experience
+from experiences.serializers import ExperienceListSerializer
+from medias.models import Photo
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from rooms.models import Room
+from rooms.serializers import RoomListSerializer
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+
+    help = "Compare DRF and compiled serialization of the list payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1000, 10000],
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        for rows in options["rows"]:
+            try:
+                with transaction.atomic():
+                    self.create_rows(rows)
+                    self.compare(rows, options["repeat"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def create_rows(self, count):
+        user = User.objects.create(username="benchmark-user")
+        rooms = Room.objects.bulk_create(
+            Room(
+                name=f"Room {number}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                address="Address",
+                kind=Room.RoomKindChocies.ENTIRE_PLACE,
+                owner=user,
+            )
+            for number in range(count)
+        )
+        experiences = Experience.objects.bulk_create(
+            Experience(
+                name=f"Experience {number}",
+                price=100,
+                address="Address",
+                start=datetime.time(9),
+                end=datetime.time(12),
+                description="Description",
+                host=user,
+            )
+            for number in range(count)
+        )
+        Photo.objects.bulk_create(
+            Photo(file="https://example.com/photo.jpg", room=room) for room in rooms
+        )
+        Photo.objects.bulk_create(
+            Photo(file="https://example.com/photo.jpg", experience=experience)
+            for experience in experiences
+        )
+        Review.objects.bulk_create(
+            Review(user=user, room=room, payload="Review", rating=4) for room in rooms
+        )
+        check_in = datetime.date.today()
+        Booking.objects.bulk_create(
+            Booking(
+                kind=Booking.BookingKindChoices.ROOM,
+                user=user,
+                room=room,
+                check_in=check_in,
+                check_out=check_in + datetime.timedelta(days=1),
+                guests=1,
+            )
+            for room in rooms
+        )
+
+    def compare(self, rows, repeat):
+        renderer = JSONRenderer()
+        for serializer_class, queryset in (
+            (RoomListSerializer, Room.objects.prefetch_related("photos")),
+            (
+                ExperienceListSerializer,
+                Experience.objects.select_related("video").prefetch_related("photos"),
+            ),
+            (ReviewSerializer, Review.objects.select_related("user")),
+            (
+                PublicBookingSerializer,
+                Booking.objects.select_related("user", "room"),
+            ),
+        ):
+            queryset = queryset.order_by("pk")
+            timings = {}
+            for name, serialize in (
+                (
+                    "drf",
+                    lambda: serializer_class(
+                        queryset.all(),
+                        many=True,
+                    ).data,
+                ),
+                ("fast", lambda: fast_data(serializer_class, queryset)),
+            ):
+                best = None
+                for attempt in range(repeat):
+                    start = time.perf_counter()
+                    content = renderer.render(serialize())
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                timings[name] = (best, content)
+            drf, drf_content = timings["drf"]
+            fast, fast_content = timings["fast"]
+            self.stdout.write(
+                f"{serializer_class.__name__:<26} {rows:>6} rows  "
+                f"drf {drf * 1000:8.1f} ms  fast {fast * 1000:8.1f} ms  "
+                f"x{drf / fast:4.1f}  "
+                f"{'identical' if drf_content == fast_content else 'DIFFERENT'}"
+            )
@@ -0,0 +1,68 @@
+import threading
+import time
+from contextlib import contextmanager
+
+lock = threading.Lock()
+
+counters = {}
+
+timers = {}
+
+gauges = {}
+
+
+def increment(name, value=1):
+    with lock:
+        counters[name] = counters.get(name, 0) + value
+
+
+def record(name, seconds):
+    with lock:
+        stat = timers.setdefault(
+            name,
+            {"count": 0, "total": 0.0, "max": 0.0},
+        )
+        stat["count"] += 1
+        stat["total"] += seconds
+        stat["max"] = max(stat["max"], seconds)
+
+
+def gauge(name, value):
+    with lock:
+        stat = gauges.setdefault(name, {"value": 0, "max": 0})
+        stat["value"] = value
+        stat["max"] = max(stat["max"], value)
+
+
+@contextmanager
+def timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def snapshot():
+    """Per-process counters and timings in milliseconds."""
+    with lock:
+        return {
+            "counters": dict(counters),
+            "timers": {
+                name: {
+                    "count": stat["count"],
+                    "total_ms": round(stat["total"] * 1000, 3),
+                    "avg_ms": round(stat["total"] * 1000 / stat["count"], 3),
+                    "max_ms": round(stat["max"] * 1000, 3),
+                }
+                for name, stat in timers.items()
+            },
+            "gauges": {name: dict(stat) for name, stat in gauges.items()},
+        }
+
+
+def reset():
+    with lock:
+        counters.clear()
+        timers.clear()
+        gauges.clear()
@@ -0,0 +1,126 @@
+import gzip
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# (payload size limit, level), first match wins: spend CPU on the small
+# payloads and keep the big ones cheap. Streams have no size up front.
+LEVELS = {
+    "br": ((64 * 1024, 5), (1024 * 1024, 4), (None, 1)),
+    "gzip": ((64 * 1024, 6), (1024 * 1024, 4), (None, 1)),
+}
+
+STREAMING_LEVEL = {"br": 4, "gzip": 4}
+
+
+def get_level(encoding, size):
+    for limit, level in LEVELS[encoding]:
+        if limit is None or size < limit:
+            return level
+
+
+def parse_accept_encoding(header):
+    accepted = set()
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def choose_encoding(request):
+    accepted = parse_accept_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(content, encoding, level):
+    if encoding == "br":
+        return brotli.compress(
+            content,
+            mode=brotli.MODE_TEXT,
+            quality=level,
+        )
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding, level):
+    """Compress a stream, flushing after every chunk so none is held back."""
+    if encoding == "br":
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+
+    """Brotli or gzip for JSON API responses
+
+    Like django.middleware.gzip.GZipMiddleware, but limited to JSON, with a
+    size threshold, a compression level picked from the payload size and
+    Brotli when the client accepts it.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith("application/json"):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content,
+                encoding,
+                STREAMING_LEVEL[encoding],
+            )
+            del response.headers["Content-Length"]
+        else:
+            content = compress(
+                response.content,
+                encoding,
+                get_level(encoding, len(response.content)),
+            )
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        # A strong ETag has to become weak once the bytes change, the weak
+        # comparison of If-None-Match still matches it.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+
+    """Pages by (created_at, pk) so every page costs the same as the first"""
+
+    cursor_query_param = "cursor"
+
+    def __init__(self, page_size=None, descending=False):
+        self.page_size = page_size or settings.PAGE_SIZE
+        self.descending = descending
+        self.next_cursor = None
+
+    def encode_cursor(self, created_at, pk):
+        payload = json.dumps([created_at.isoformat(), pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, pk = json.loads(payload)
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, TypeError, ValueError):
+            raise ParseError("Invalid cursor")
+        if created_at is None:
+            raise ParseError("Invalid cursor")
+        return created_at, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if self.descending:
+            queryset = queryset.order_by("-created_at", "-pk")
+        else:
+            queryset = queryset.order_by("created_at", "pk")
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            if self.descending:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+                )
+        results = list(queryset[: self.page_size + 1])
+        self.next_cursor = None
+        if len(results) > self.page_size:
+            results = results[: self.page_size]
+            last = results[-1]
+            if isinstance(last, dict):
+                # .values() rows, which have to include created_at
+                self.next_cursor = self.encode_cursor(
+                    last["created_at"],
+                    last["pk"],
+                )
+            else:
+                self.next_cursor = self.encode_cursor(last.created_at, last.pk)
+        return results
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.next_cursor,
+        )
+
+    def get_paginated_response(self, data):
+        headers = {}
+        if self.next_cursor is not None:
+            headers["Link"] = f'<{self.get_next_link()}>; rel="next"'
+            headers["X-Next-Cursor"] = self.next_cursor
+        return Response(data, headers=headers)
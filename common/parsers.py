@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from .renderers import ORJSONRenderer
+
+
+def read_text(stream, parser_context):
+    encoding = (parser_context or {}).get(
+        "encoding",
+        settings.DEFAULT_CHARSET,
+    )
+    try:
+        return stream.read().decode(encoding)
+    except UnicodeDecodeError as exc:
+        raise ParseError(f"Invalid encoding: {exc}")
+
+
+class ORJSONParser(JSONParser):
+
+    """JSONParser on orjson, for UTF-8 bodies"""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get(
+            "encoding",
+            settings.DEFAULT_CHARSET,
+        )
+        if encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class JSONLinesParser(BaseParser):
+
+    """One JSON object per line, parsed into a list of dicts"""
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        rows = []
+        text = read_text(stream, parser_context)
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise ParseError(f"Line {number}: {exc}")
+            if not isinstance(row, dict):
+                raise ParseError(f"Line {number}: expected an object")
+            rows.append(row)
+        return rows
+
+
+class CSVParser(BaseParser):
+
+    """CSV with a header row, parsed into a list of dicts"""
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        reader = csv.DictReader(io.StringIO(read_text(stream, parser_context)))
+        try:
+            return [
+                {key: value for key, value in row.items() if key is not None}
+                for row in reader
+            ]
+        except csv.Error as exc:
+            raise ParseError(f"Line {reader.line_num}: {exc}")
@@ -0,0 +1,41 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    """JSONRenderer on orjson, with the same bytes as the stdlib path
+
+    orjson only handles the containers and scalars. Dates, times and
+    datetimes are passed through to DRF's encoder so they keep its format,
+    as do Decimal, lazy strings and anything else orjson doesn't know.
+    Indented, ASCII only or non compact output, and anything orjson
+    refuses, falls back to JSONRenderer.
+    """
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(
+                data,
+                default=self.default,
+                option=self.options,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, to stay a strict javascript subset
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
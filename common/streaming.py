@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from .fast_serializers import FastSerializer
+from .renderers import ORJSONRenderer
+
+
+def iterate_in_chunks(queryset, chunk_size):
+    """Walk a queryset by pk, one prefetched chunk at a time.
+
+    QuerySet.iterator() drops prefetch_related on this Django version, so
+    each chunk is its own keyset query and gets its prefetches applied.
+    """
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        chunk = queryset
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last = chunk[-1]
+        last_pk = last["pk"] if isinstance(last, dict) else last.pk
+
+
+class StreamingJSONRenderer(ORJSONRenderer):
+
+    """Renders serialized chunks as one JSON array, piece by piece"""
+
+    def render_stream(self, chunks, renderer_context=None):
+        yield b"["
+        separator = b""
+        for chunk in chunks:
+            # One piece per chunk, the array brackets of each are dropped
+            yield separator + self.render(
+                chunk,
+                renderer_context=renderer_context,
+            )[1:-1]
+            separator = b","
+        yield b"]"
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+
+    """A JSON array response that never holds the whole list in memory
+
+    Django 4.0 iterates streaming responses inside the event loop under
+    ASGI, where the queries of each chunk aren't allowed, so there the
+    array is rendered up front and sent as a single piece.
+    """
+
+    def __init__(
+        self,
+        queryset,
+        serializer_class,
+        context=None,
+        chunk_size=None,
+        **kwargs,
+    ):
+        chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+        if isinstance(serializer_class, FastSerializer):
+            chunks = (
+                serializer_class.serialize(rows, context)
+                for rows in iterate_in_chunks(
+                    serializer_class.values(queryset),
+                    chunk_size,
+                )
+            )
+        else:
+            chunks = (
+                serializer_class(objects, many=True, context=context).data
+                for objects in iterate_in_chunks(queryset, chunk_size)
+            )
+        content = StreamingJSONRenderer().render_stream(chunks)
+        if is_asgi((context or {}).get("request")):
+            content = [b"".join(content)]
+        super().__init__(
+            content,
+            content_type="application/json",
+            **kwargs,
+        )
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+def wants_stream(request):
+    return request.query_params.get("stream") in ("1", "true")
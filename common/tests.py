@@ -1,3 +1,307 @@
-from django.test import TestCase
+import brotli
+import datetime
+import decimal
+import gzip
+import io
+import json
+import zlib
+import orjson
+from unittest import mock
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from bookings.models import Booking
+from bookings.serializers import PublicBookingSerializer
+from common.fast_serializers import fast_data
+from common.middleware import compress_stream
+from common.parsers import ORJSONParser
+from common.renderers import ORJSONRenderer
+from experiences.models import Experience
+from experiences.serializers import ExperienceListSerializer
+from medias.models import Photo, Video
+from rooms.models import Room
+from rooms.serializers import RoomListSerializer
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from users.models import User
 
-# Create your tests here.
+
+class TestKeysetPagination(APITestCase):
+    def setUp(self):
+        user = User.objects.create(
+            username="test",
+        )
+        self.room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=user,
+        )
+        for number in range(7):
+            Review.objects.create(
+                user=user,
+                room=self.room,
+                payload=f"Review {number}",
+                rating=5,
+            )
+
+    def test_walk_all_pages(self):
+
+        url = f"/api/v1/rooms/{self.room.pk}/reviews"
+        payloads = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            payloads += [review["payload"] for review in response.json()]
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            url = cursor and (f"/api/v1/rooms/{self.room.pk}/reviews?cursor={cursor}")
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(
+            payloads,
+            [f"Review {number}" for number in range(7)],
+        )
+
+    def test_invalid_cursor(self):
+
+        response = self.client.get(f"/api/v1/rooms/{self.room.pk}/reviews?cursor=nope")
+
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+
+class TestFastSerializer(APITestCase):
+    def setUp(self):
+        user = User.objects.create(
+            username="test",
+            name="Tester",
+        )
+        room = Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=user,
+        )
+        Room.objects.create(
+            name="Empty Room",
+            price=50,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=Room.RoomKindChocies.SHARED_ROOM,
+            owner=user,
+        )
+        experience = Experience.objects.create(
+            name="Experience",
+            price=30,
+            address="Address",
+            start=datetime.time(9, 30),
+            end=datetime.time(12),
+            description="Description",
+            host=user,
+        )
+        Experience.objects.create(
+            name="No Video",
+            price=30,
+            address="Address",
+            start=datetime.time(9),
+            end=datetime.time(10),
+            description="Description",
+            host=user,
+        )
+        for number in range(2):
+            Photo.objects.create(
+                file=f"https://example.com/{number}.jpg",
+                description=f"Photo {number}",
+                room=room,
+            )
+        Photo.objects.create(
+            file="https://example.com/experience.jpg",
+            experience=experience,
+        )
+        Video.objects.create(
+            file="https://example.com/video.mp4",
+            experience=experience,
+        )
+        Review.objects.create(user=user, room=room, payload="Nice", rating=3)
+        Review.objects.create(user=user, room=room, payload="Okay", rating=4)
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=user,
+            room=room,
+            check_in=datetime.date(2030, 1, 1),
+            check_out=datetime.date(2030, 1, 3),
+            guests=2,
+        )
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.EXPERIENCE,
+            user=user,
+            experience=experience,
+            experience_time=datetime.datetime(
+                2030,
+                1,
+                1,
+                10,
+                tzinfo=datetime.timezone.utc,
+            ),
+            guests=1,
+        )
+
+    def assertSameJSON(self, serializer_class, queryset):
+        renderer = JSONRenderer()
+        queryset = queryset.order_by("pk")
+        self.assertEqual(
+            renderer.render(fast_data(serializer_class, queryset)),
+            renderer.render(serializer_class(queryset, many=True).data),
+        )
+
+    def test_output_is_byte_identical(self):
+
+        self.assertSameJSON(RoomListSerializer, Room.objects.all())
+        self.assertSameJSON(ExperienceListSerializer, Experience.objects.all())
+        self.assertSameJSON(ReviewSerializer, Review.objects.all())
+        self.assertSameJSON(PublicBookingSerializer, Booking.objects.all())
+
+
+class TestORJSONRenderer(APITestCase):
+
+    DATA = {
+        "price": decimal.Decimal("10.50"),
+        "check_in": datetime.date(2030, 1, 1),
+        "created_at": datetime.datetime(
+            2030,
+            1,
+            1,
+            9,
+            30,
+            15,
+            123456,
+            tzinfo=datetime.timezone.utc,
+        ),
+        "start": datetime.time(9, 30, 0, 500000),
+        "label": gettext_lazy("Rooms"),
+        "text": "한국 \u2028 line",
+        1: [1.5, None, True],
+    }
+
+    def test_same_bytes_as_json_renderer(self):
+
+        self.assertEqual(
+            ORJSONRenderer().render(self.DATA),
+            JSONRenderer().render(self.DATA),
+        )
+
+    def test_api_responses_use_orjson(self):
+
+        with mock.patch(
+            "common.renderers.orjson.dumps",
+            wraps=orjson.dumps,
+        ) as dumps:
+            response = self.client.get("/api/v1/rooms/amenities/")
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        dumps.assert_called_once()
+
+    def test_indent_uses_json_renderer(self):
+
+        content = ORJSONRenderer().render(
+            {"a": 1},
+            "application/json; indent=4",
+        )
+
+        self.assertEqual(content, b'{\n    "a": 1\n}')
+
+    def test_parser(self):
+
+        parser = ORJSONParser()
+
+        self.assertEqual(
+            parser.parse(io.BytesIO('{"name": "한국"}'.encode())),
+            {"name": "한국"},
+        )
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b"{nope"))
+
+
+class TestCompressionMiddleware(APITestCase):
+
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        user = User.objects.create(
+            username="test",
+        )
+        Room.objects.bulk_create(
+            Room(
+                name=f"Room {number}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                address="Address",
+                kind=Room.RoomKindChocies.ENTIRE_PLACE,
+                owner=user,
+            )
+            for number in range(30)
+        )
+
+    def test_brotli_is_preferred(self):
+
+        response = self.client.get(self.URL, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(len(json.loads(brotli.decompress(response.content))), 24)
+
+    def test_gzip(self):
+
+        response = self.client.get(
+            self.URL,
+            HTTP_ACCEPT_ENCODING="gzip, br;q=0",
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 24)
+
+    def test_small_and_unaccepted_responses_are_untouched(self):
+
+        response = self.client.get(
+            "/api/v1/rooms/amenities/",
+            HTTP_ACCEPT_ENCODING="gzip, br",
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        response = self.client.get(self.URL)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(response.json()), 24)
+
+    def test_streaming_response(self):
+
+        response = self.client.get(
+            self.URL,
+            {"stream": "true"},
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        content = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(len(json.loads(content)), 30)
+
+    def test_stream_chunks_are_flushed(self):
+
+        chunks = [b'[{"a": 1}', b', {"b": 2}]']
+        for encoding, decompress in (
+            ("gzip", zlib.decompressobj(16 + zlib.MAX_WBITS).decompress),
+            ("br", brotli.Decompressor().process),
+        ):
+            compressed = compress_stream(iter(chunks), encoding, 4)
+            # Each chunk can be decoded as soon as it is sent
+            for chunk in chunks:
+                self.assertEqual(decompress(next(compressed)), chunk)
@@ -1,3 +1,12 @@
-from django.shortcuts import render
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import metrics
 
-# Create your views here.
+
+class Metrics(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
@@ -1,9 +1,62 @@
+import copy
+import datetime
+import time
+import uuid
 import jwt
 from django.conf import settings
-from rest_framework.authentication import BaseAuthentication
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from rest_framework.authentication import (
+    BaseAuthentication,
+    SessionAuthentication,
+    TokenAuthentication,
+)
 from rest_framework.exceptions import AuthenticationFailed
+from common import metrics
+from common.cache import LocalCache, now_and_on_commit
 from users.models import User
 
+verified_tokens = LocalCache(
+    max_entries=settings.JWT_CACHE_MAX_ENTRIES,
+    timeout=settings.JWT_CACHE_TIMEOUT,
+)
+
+
+def create_token(user):
+    now = timezone.now()
+    return jwt.encode(
+        {
+            "pk": user.pk,
+            "iat": now,
+            "exp": now + datetime.timedelta(seconds=settings.JWT_LIFETIME),
+            "jti": uuid.uuid4().hex,
+            "pwd": user.get_session_auth_hash(),
+        },
+        settings.SECRET_KEY,
+        algorithm="HS256",
+    )
+
+
+def get_state_keys(claims):
+    """Shared cache keys that outdate the verified tokens of every worker."""
+    return f"jwt:revoked:{claims['jti']}", f"jwt:user:{claims['pk']}"
+
+
+def revoke_token(claims):
+    timeout = claims["exp"] - int(time.time())
+    if timeout > 0:
+        cache.set(f"jwt:revoked:{claims['jti']}", True, timeout)
+    verified_tokens.delete_matching(lambda entry: entry[1]["jti"] == claims["jti"])
+
+
+def forget_user_tokens(user):
+    # A new version makes the other workers verify the token again
+    now_and_on_commit(
+        lambda: cache.set(f"jwt:user:{user.pk}", time.time_ns(), settings.JWT_LIFETIME)
+    )
+    verified_tokens.delete_matching(lambda entry: entry[0].pk == user.pk)
+
 
 class TrustMeBroAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -18,20 +71,101 @@ class TrustMeBroAuthentication(BaseAuthentication):
 
 
 class JWTAuthentication(BaseAuthentication):
-    def authenticate(self, request):
-        token = request.headers.get("Authorization")
-        if not token:
-            return None
-        decoded = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=["HS256"],
-        )
-        pk = decoded.get("pk")
+    def verify(self, token):
+        try:
+            claims = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=["HS256"],
+                options={"require": ["exp", "iat", "jti"]},
+            )
+        except jwt.InvalidTokenError:
+            raise AuthenticationFailed("Invalid Token")
+        pk = claims.get("pk")
         if not pk:
             raise AuthenticationFailed("Invalid Token")
+        revoked_key, version_key = get_state_keys(claims)
+        state = cache.get_many([revoked_key, version_key])
+        if state.get(revoked_key):
+            raise AuthenticationFailed("Invalid Token")
         try:
             user = User.objects.get(pk=pk)
-            return (user, None)
         except User.DoesNotExist:
             raise AuthenticationFailed("User Not Found")
+        if not user.is_active or not constant_time_compare(
+            claims.get("pwd", ""),
+            user.get_session_auth_hash(),
+        ):
+            raise AuthenticationFailed("Invalid Token")
+        verified_tokens.set(
+            token,
+            (user, claims, state.get(version_key)),
+            min(settings.JWT_CACHE_TIMEOUT, claims["exp"] - time.time()),
+        )
+        return user, claims
+
+    def authenticate_header(self, request):
+        return "Bearer"
+
+    def authenticate(self, request):
+        token = request.headers.get("Authorization")
+        if not token:
+            return None
+        if token.startswith("Bearer "):
+            token = token[len("Bearer ") :]
+        entry = verified_tokens.get(token)
+        if entry is not None:
+            # One round trip to the shared cache instead of the database
+            user, claims, version = entry
+            revoked_key, version_key = get_state_keys(claims)
+            state = cache.get_many([revoked_key, version_key])
+            if state.get(revoked_key) or state.get(version_key) != version:
+                entry = None
+        if entry is None:
+            user, claims = self.verify(token)
+        return (copy.copy(user), claims)
+
+
+class DispatchAuthentication(BaseAuthentication):
+
+    """Read the headers once and run only the backend they point to"""
+
+    backends = {
+        "token": TokenAuthentication(),
+        "session": SessionAuthentication(),
+        "trust_me": TrustMeBroAuthentication(),
+        "jwt": JWTAuthentication(),
+    }
+
+    def get_backend_name(self, request):
+        authorization = request.headers.get("Authorization")
+        if authorization:
+            if authorization.lower().startswith("token "):
+                return "token"
+            return "jwt"
+        if request.headers.get("Trust-Me"):
+            return "trust_me"
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return "session"
+        return None
+
+    def authenticate(self, request):
+        name = self.get_backend_name(request)
+        if name is None:
+            metrics.increment("auth.anonymous")
+            return None
+        with metrics.timer(f"auth.{name}"):
+            try:
+                return self.backends[name].authenticate(request)
+            except AuthenticationFailed:
+                metrics.increment(f"auth.{name}.failed")
+                raise
+
+    def authenticate_header(self, request):
+        # The challenge of the backend the credentials were meant for, so
+        # rejected tokens stay 401. Anonymous and session requests get none
+        # and answer 403, like SessionAuthentication.
+        name = self.get_backend_name(request)
+        if name is None:
+            return None
+        return self.backends[name].authenticate_header(request)
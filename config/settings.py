@@ -60,6 +60,7 @@ CUSTOM_APPS = [
     "bookings.apps.BookingsConfig",
     "medias.apps.MediasConfig",
     "direct_messages.apps.DirectMessagesConfig",
+    "search.apps.SearchConfig",
 ]
 
 SYSTEM_APPS = [
@@ -78,6 +79,7 @@ MIDDLEWARE = [
     "users.middleware.MyMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "common.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -126,9 +128,51 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "airbnb-clone",
+            "OPTIONS": {
+                "MAX_ENTRIES": 1000,
+            },
+        }
+    }
+
+API_CACHE_TIMEOUT = 60 * 5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
+PASSWORD_HASHERS = [
+    "users.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+PASSWORD_HASH_ITERATIONS = env.int("PASSWORD_HASH_ITERATIONS", default=320000)
+
+PASSWORD_HASH_WORKERS = env.int("PASSWORD_HASH_WORKERS", default=2)
+
+PASSWORD_HASH_QUEUE = env.int("PASSWORD_HASH_QUEUE", default=8)
+
+PASSWORD_HASH_RETRY_AFTER = 1
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -183,14 +227,52 @@ MEDIA_URL = "user-uploads/"
 
 PAGE_SIZE = 3
 
+JWT_LIFETIME = 60 * 60 * 24 * 7
+
+JWT_CACHE_TIMEOUT = 60
+
+JWT_CACHE_MAX_ENTRIES = 10000
+
+LIST_PAGE_SIZE = 24
+
+STREAM_CHUNK_SIZE = 500
+
+MAX_STAY_NIGHTS = 90
+
+COMPRESSION_MIN_SIZE = 1024
+
+CHAT_QUEUE_SIZE = 100
+
+CHAT_BATCH_SIZE = 100
+
+CHAT_FLUSH_INTERVAL = 0.05
+
+CHAT_MAX_PENDING = 1000
+
+CHAT_SAVE_ATTEMPTS = 3
+
+CHAT_MAX_LENGTH = 2000
+
+MESSAGE_RETENTION_DAYS = env.int("MESSAGE_RETENTION_DAYS", default=365)
+
+# Archived messages are deleted from the database, so this has to be a
+# persistent disk, the instance's own disk is wiped on every deploy
+MESSAGE_ARCHIVE_ROOT = env("MESSAGE_ARCHIVE_ROOT", default=None)
+
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
-        "config.authentication.TrustMeBroAuthentication",
-        "config.authentication.JWTAuthentication",
-    ]
+        "config.authentication.DispatchAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 if DEBUG:
@@ -203,9 +285,17 @@ else:
 
 CORS_ALLOW_CREDENTIALS = True
 
+CORS_EXPOSE_HEADERS = ["Link", "X-Next-Cursor"]
+
 
 GH_SECRET = env("GH_SECRET")
 
+OAUTH_TIMEOUT = (3.05, 10)
+
+OAUTH_RETRIES = 2
+
+OAUTH_POOL_SIZE = 10
+
 if not DEBUG:
     sentry_sdk.init(
         dsn="https://23c3fe33151d4bd0b57ee6956cf69c7d@o4504955457372160.ingest.sentry.io/4504955479523328",
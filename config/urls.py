@@ -17,6 +17,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
+from common.views import Metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -26,4 +27,7 @@ urlpatterns = [
     path("api/v1/medias/", include("medias.urls")),
     path("api/v1/wishlists/", include("wishlists.urls")),
     path("api/v1/users/", include("users.urls")),
+    path("api/v1/search/", include("search.urls")),
+    path("api/v1/direct-messages/", include("direct_messages.urls")),
+    path("api/v1/metrics/", Metrics.as_view()),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,53 @@
+import gzip
+import json
+import os
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from common import metrics
+from .models import Message
+
+FIELDS = ("pk", "room_id", "user_id", "text", "created_at", "updated_at")
+
+
+def get_archive_path(root, created_at):
+    return os.path.join(root, f"messages-{created_at:%Y-%m}.jsonl.gz")
+
+
+def write_archive(path, rows):
+    # Every batch is its own gzip member, appending keeps the file readable
+    # with gzip.open and zcat.
+    with gzip.open(path, "at", encoding="utf-8") as archive:
+        for row in rows:
+            archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+    with open(path, "rb") as archive:
+        os.fsync(archive.fileno())
+
+
+def archive_messages(cutoff, root, batch_size):
+    """Move messages created before cutoff into monthly gzipped JSON lines.
+
+    Works oldest first in batches, each written and synced to its archive
+    file before its rows are deleted in a short transaction of its own. A
+    crash in between leaves the batch in both places, so archives hold
+    every message at least once and can be deduplicated by pk.
+    """
+    os.makedirs(root, exist_ok=True)
+    archived = 0
+    while True:
+        rows = list(
+            Message.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at", "pk")
+            .values(*FIELDS)[:batch_size]
+        )
+        if not rows:
+            return archived
+        months = {}
+        for row in rows:
+            path = get_archive_path(root, row["created_at"])
+            months.setdefault(path, []).append(row)
+        with metrics.timer("direct_messages.archive"):
+            for path, month_rows in months.items():
+                write_archive(path, month_rows)
+            with transaction.atomic():
+                Message.objects.filter(pk__in=[row["pk"] for row in rows]).delete()
+        archived += len(rows)
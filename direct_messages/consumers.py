@@ -0,0 +1,123 @@
+import asyncio
+import json
+import re
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.http import parse_cookie
+from rest_framework.exceptions import AuthenticationFailed
+from common import metrics
+from config.authentication import JWTAuthentication
+from .models import ChattingRoom
+from .pubsub import get_pubsub
+from .writer import MessageWriter
+
+ROOM_PATH = re.compile(r"^/ws/direct-messages/(?P<pk>\d+)$")
+
+writer = MessageWriter(get_pubsub)
+
+
+def get_headers(scope):
+    return {
+        name.decode("latin1").lower(): value.decode("latin1")
+        for name, value in scope.get("headers", [])
+    }
+
+
+@sync_to_async
+def get_scope_user(scope):
+    """The user of a ?token= JWT, or of the session cookie."""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    if query.get("token"):
+        try:
+            user, claims = JWTAuthentication().verify(query["token"][0])
+        except AuthenticationFailed:
+            return None
+        return user
+    headers = get_headers(scope)
+    session_key = parse_cookie(headers.get("cookie", "")).get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not session_key:
+        return None
+    # A browser sends the cookie from any page, so check where it came from
+    origin = headers.get("origin")
+    if origin and origin not in settings.CORS_ALLOWED_ORIGINS:
+        return None
+    engine = import_module(settings.SESSION_ENGINE)
+    user = get_user(SimpleNamespace(session=engine.SessionStore(session_key)))
+    if not user.is_authenticated:
+        return None
+    return user
+
+
+@sync_to_async
+def is_member(user, room_pk):
+    return ChattingRoom.objects.filter(pk=room_pk, users=user).exists()
+
+
+class ChatConnection:
+
+    """One accepted socket: reads into the writer, sends from its outbox"""
+
+    def __init__(self, receive, send, user, room_pk):
+        self.receive = receive
+        self.send = send
+        self.user = user
+        self.room_pk = room_pk
+
+    async def run(self):
+        pubsub = get_pubsub()
+        subscription = await pubsub.subscribe(self.room_pk)
+        await self.send({"type": "websocket.accept"})
+        metrics.increment("direct_messages.connections")
+        sender = asyncio.create_task(self.send_messages(subscription))
+        try:
+            await self.receive_messages(subscription)
+        finally:
+            sender.cancel()
+            await pubsub.unsubscribe(self.room_pk, subscription)
+            metrics.increment("direct_messages.connections", -1)
+
+    async def receive_messages(self, subscription):
+        while True:
+            event = await self.receive()
+            if event["type"] == "websocket.disconnect":
+                return
+            if event["type"] != "websocket.receive":
+                continue
+            try:
+                text = json.loads(event.get("text") or "")["text"].strip()
+            except (KeyError, TypeError, AttributeError, ValueError):
+                text = None
+            if not text or len(text) > settings.CHAT_MAX_LENGTH:
+                subscription.deliver({"type": "error", "error": 'Send {"text": ...}'})
+                continue
+            await writer.submit(self.room_pk, self.user, text, subscription)
+
+    async def send_messages(self, subscription):
+        while True:
+            message = await subscription.queue.get()
+            await self.send({"type": "websocket.send", "text": json.dumps(message)})
+            if subscription.overflowed and subscription.queue.empty():
+                await self.send({"type": "websocket.close", "code": 1013})
+                return
+
+
+async def websocket_application(scope, receive, send):
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+    match = ROOM_PATH.match(scope["path"])
+    if match is None:
+        await send({"type": "websocket.close", "code": 4404})
+        return
+    room_pk = int(match["pk"])
+    user = await get_scope_user(scope)
+    if user is None or not await is_member(user, room_pk):
+        await send({"type": "websocket.close", "code": 4403})
+        return
+    await ChatConnection(receive, send, user, room_pk).run()
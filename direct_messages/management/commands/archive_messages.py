@@ -0,0 +1,44 @@
+import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from direct_messages.archive import archive_messages
+from direct_messages.models import Message
+
+
+class Command(BaseCommand):
+
+    help = "Move old direct messages into monthly gzipped archive files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.MESSAGE_RETENTION_DAYS,
+        )
+        parser.add_argument(
+            "--output",
+            default=settings.MESSAGE_ARCHIVE_ROOT,
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        if options["dry_run"]:
+            count = Message.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"{count} messages are older than {cutoff}.")
+            return
+        if not options["output"]:
+            raise CommandError(
+                "Set MESSAGE_ARCHIVE_ROOT or --output to a persistent "
+                "directory, the archived messages are deleted."
+            )
+        archived = archive_messages(
+            cutoff,
+            options["output"],
+            options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {archived} messages to {options['output']}.")
+        )
@@ -0,0 +1,101 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def populate_last_messages(apps, schema_editor):
+    ChattingRoom = apps.get_model("direct_messages", "ChattingRoom")
+    Message = apps.get_model("direct_messages", "Message")
+    ChattingRoom.objects.update(
+        last_message=Subquery(
+            Message.objects.filter(room=OuterRef("pk")).order_by("-pk").values("pk")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_alter_user_is_host"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("direct_messages", "0002_alter_message_room_alter_message_user"),
+    ]
+
+    operations = [
+        # Participant takes over the table of the plain ManyToManyField, so
+        # the existing memberships stay where they are.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="Participant",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "room",
+                            models.ForeignKey(
+                                db_column="chattingroom_id",
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="participants",
+                                to="direct_messages.chattingroom",
+                            ),
+                        ),
+                        (
+                            "user",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="participants",
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "direct_messages_chattingroom_users",
+                        "unique_together": {("room", "user")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="chattingroom",
+                    name="users",
+                    field=models.ManyToManyField(
+                        through="direct_messages.Participant",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="last_read_message_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="chattingroom",
+            name="last_message",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="direct_messages.message",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["room", "created_at", "id"],
+                name="message_room_created_idx",
+            ),
+        ),
+        migrations.RunPython(populate_last_messages, migrations.RunPython.noop),
+    ]
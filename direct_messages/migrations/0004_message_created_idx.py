@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("direct_messages", "0003_participant_chattingroom_last_message_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(fields=["created_at", "id"], name="message_created_idx"),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from common.models import CommonModel
 
 
@@ -8,12 +9,67 @@ class ChattingRoom(CommonModel):
 
     users = models.ManyToManyField(
         "users.User",
+        through="direct_messages.Participant",
+    )
+    last_message = models.ForeignKey(
+        "direct_messages.Message",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
     )
 
     def __str__(self) -> str:
         return "Chatting Room"
 
 
+class Participant(models.Model):
+
+    """A user in a chatting room and how far they have read"""
+
+    room = models.ForeignKey(
+        "direct_messages.ChattingRoom",
+        on_delete=models.CASCADE,
+        related_name="participants",
+        db_column="chattingroom_id",
+    )
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        related_name="participants",
+    )
+    last_read_message_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        # The table the plain ManyToManyField created
+        db_table = "direct_messages_chattingroom_users"
+        unique_together = ("room", "user")
+
+    def __str__(self) -> str:
+        return f"{self.user} in {self.room_id}"
+
+
+class MessageQuerySet(models.QuerySet):
+
+    """Keeps ChattingRoom.last_message up to date"""
+
+    def refresh_last_messages(self, room_pks):
+        if not room_pks:
+            return
+        ChattingRoom.objects.filter(pk__in=room_pks).update(
+            last_message=Subquery(
+                self.model.objects.filter(room=OuterRef("pk"))
+                .order_by("-pk")
+                .values("pk")[:1]
+            )
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        messages = super().bulk_create(objs, *args, **kwargs)
+        self.refresh_last_messages({message.room_id for message in messages})
+        return messages
+
+
 class Message(CommonModel):
 
     """Message model definition"""
@@ -32,5 +88,19 @@ class Message(CommonModel):
         related_name="messages",
     )
 
+    objects = MessageQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "created_at", "id"],
+                name="message_room_created_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                name="message_created_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.user} says: {self.text}"
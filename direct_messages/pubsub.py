@@ -0,0 +1,125 @@
+import asyncio
+import json
+import redis.asyncio as redis
+from django.conf import settings
+from common import metrics
+
+
+class Subscription:
+
+    """One socket's bounded outbox"""
+
+    def __init__(self, size):
+        self.queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+
+    def deliver(self, message):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client reads slower than the room talks, it gets closed
+            # once its outbox drains and reloads the history on reconnect.
+            self.overflowed = True
+            metrics.increment("direct_messages.overflow")
+
+
+class InMemoryPubSub:
+
+    """Fan-out to the sockets of this process only"""
+
+    def __init__(self):
+        self.rooms = {}
+
+    async def subscribe(self, room_pk):
+        subscription = Subscription(settings.CHAT_QUEUE_SIZE)
+        self.rooms.setdefault(room_pk, set()).add(subscription)
+        return subscription
+
+    async def unsubscribe(self, room_pk, subscription):
+        subscriptions = self.rooms.get(room_pk, set())
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            self.rooms.pop(room_pk, None)
+
+    async def publish(self, room_pk, message):
+        self.deliver(room_pk, message)
+
+    def deliver(self, room_pk, message):
+        for subscription in list(self.rooms.get(room_pk, ())):
+            subscription.deliver(message)
+
+
+class RedisPubSub(InMemoryPubSub):
+
+    """Fan-out through Redis channels, so every worker sees every room
+
+    Each process subscribes to the channel of a room while it has sockets
+    in it and hands what arrives to its local subscriptions.
+    """
+
+    prefix = "direct_messages:"
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self.client = None
+        self.pubsub = None
+        self.listener = None
+
+    def get_client(self):
+        if self.client is None:
+            self.client = redis.from_url(self.url)
+            self.pubsub = self.client.pubsub()
+        return self.client
+
+    def get_channel(self, room_pk):
+        return f"{self.prefix}{room_pk}"
+
+    async def subscribe(self, room_pk):
+        self.get_client()
+        subscription = await super().subscribe(room_pk)
+        if len(self.rooms[room_pk]) == 1:
+            await self.pubsub.subscribe(self.get_channel(room_pk))
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.create_task(self.listen())
+        return subscription
+
+    async def unsubscribe(self, room_pk, subscription):
+        await super().unsubscribe(room_pk, subscription)
+        if room_pk not in self.rooms:
+            await self.pubsub.unsubscribe(self.get_channel(room_pk))
+
+    async def publish(self, room_pk, message):
+        await self.get_client().publish(
+            self.get_channel(room_pk),
+            json.dumps(message),
+        )
+
+    async def listen(self):
+        while self.rooms:
+            item = await self.pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=1.0,
+            )
+            if item is None:
+                continue
+            channel = item["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            room_pk = int(channel[len(self.prefix) :])
+            self.deliver(room_pk, json.loads(item["data"]))
+
+
+pubsub = None
+
+
+def get_pubsub():
+    global pubsub
+    if pubsub is None:
+        if settings.REDIS_URL:
+            pubsub = RedisPubSub(settings.REDIS_URL)
+        else:
+            pubsub = InMemoryPubSub()
+    return pubsub
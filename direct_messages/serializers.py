@@ -0,0 +1,35 @@
+from rest_framework import serializers
+from .models import Message, Participant
+from users.serializers import TinyUserSerializer
+
+
+class MessageSerializer(serializers.ModelSerializer):
+
+    user = TinyUserSerializer(read_only=True)
+
+    class Meta:
+        model = Message
+        fields = (
+            "pk",
+            "room",
+            "user",
+            "text",
+            "created_at",
+        )
+
+
+class ConversationSerializer(serializers.ModelSerializer):
+
+    users = TinyUserSerializer(source="room.users", many=True)
+    last_message = MessageSerializer(source="room.last_message")
+    unread = serializers.IntegerField()
+
+    class Meta:
+        model = Participant
+        fields = (
+            "room",
+            "users",
+            "last_message",
+            "last_read_message_id",
+            "unread",
+        )
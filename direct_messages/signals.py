@@ -0,0 +1,39 @@
+from functools import partial
+from threading import local
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Message
+
+
+@receiver(post_save, sender=Message)
+def refresh_saved_last_message(sender, instance, created, **kwargs):
+    if created:
+        Message.objects.refresh_last_messages({instance.room_id})
+
+
+class DeletedRooms(local):
+
+    """Rooms of the messages deleted since the last refresh, per database"""
+
+    def __init__(self):
+        self.room_pks = {}
+
+    def add(self, using, room_pk):
+        self.room_pks.setdefault(using, set()).add(room_pk)
+
+    def refresh(self, using):
+        Message.objects.refresh_last_messages(self.room_pks.pop(using, None))
+
+
+deleted_rooms = DeletedRooms()
+
+
+@receiver(post_delete, sender=Message)
+def refresh_deleted_last_message(sender, instance, using, **kwargs):
+    # Every deleted message schedules a refresh, the first to run after the
+    # commit takes all the rooms, so a batched delete costs one query. Rooms
+    # left over from a rolled back transaction are refreshed along with the
+    # next ones, which is harmless.
+    deleted_rooms.add(using, instance.room_id)
+    transaction.on_commit(partial(deleted_rooms.refresh, using), using=using)
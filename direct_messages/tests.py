@@ -1,3 +1,254 @@
+import datetime
+import gzip
+import json
+import os
+import tempfile
+from unittest import mock
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
 from django.test import TestCase
+from rest_framework.test import APITestCase
+from config.asgi import application
+from config.authentication import create_token
+from users.models import User
+from . import pubsub, writer
+from .models import ChattingRoom, Message
 
-# Create your tests here.
+
+class TestChat(TestCase):
+    def setUp(self):
+        pubsub.pubsub = None
+        self.users = [
+            User.objects.create(username=username)
+            for username in ("alice", "bob", "eve")
+        ]
+        self.room = ChattingRoom.objects.create()
+        self.room.users.add(*self.users[:2])
+
+    async def connect(self, user, path=None):
+        token = await sync_to_async(create_token)(user)
+        communicator = ApplicationCommunicator(
+            application,
+            {
+                "type": "websocket",
+                "path": path or f"/ws/direct-messages/{self.room.pk}",
+                "query_string": f"token={token}".encode(),
+                "headers": [],
+            },
+        )
+        await communicator.send_input({"type": "websocket.connect"})
+        return communicator, await communicator.receive_output(timeout=5)
+
+    async def test_messages_fan_out_to_members(self):
+        alice, accepted = await self.connect(self.users[0])
+        self.assertEqual(accepted["type"], "websocket.accept")
+        bob, accepted = await self.connect(self.users[1])
+        self.assertEqual(accepted["type"], "websocket.accept")
+
+        await alice.send_input(
+            {"type": "websocket.receive", "text": json.dumps({"text": "hi"})}
+        )
+        for communicator in (alice, bob):
+            event = await communicator.receive_output(timeout=5)
+            message = json.loads(event["text"])
+            self.assertEqual(message["text"], "hi")
+            self.assertEqual(message["user"]["username"], "alice")
+            self.assertIsNotNone(message["pk"])
+
+        saved = await sync_to_async(Message.objects.get)(room=self.room)
+        self.assertEqual(saved.text, "hi")
+        for communicator in (alice, bob):
+            await communicator.send_input({"type": "websocket.disconnect"})
+            await communicator.wait(timeout=5)
+
+    async def test_invalid_message(self):
+        alice, accepted = await self.connect(self.users[0])
+        await alice.send_input({"type": "websocket.receive", "text": "not json"})
+        event = await alice.receive_output(timeout=5)
+        self.assertEqual(json.loads(event["text"])["type"], "error")
+        await alice.send_input({"type": "websocket.disconnect"})
+        await alice.wait(timeout=5)
+
+    async def send_hi(self, save_messages):
+        alice, accepted = await self.connect(self.users[0])
+        with mock.patch.object(writer, "save_messages", save_messages):
+            with self.assertLogs("direct_messages.writer", "ERROR"):
+                await alice.send_input(
+                    {
+                        "type": "websocket.receive",
+                        "text": json.dumps({"text": "hi"}),
+                    }
+                )
+                event = await alice.receive_output(timeout=5)
+        await alice.send_input({"type": "websocket.disconnect"})
+        await alice.wait(timeout=5)
+        return json.loads(event["text"])
+
+    async def test_failed_saves_are_retried(self):
+        attempts = []
+        save = writer.save_messages
+
+        async def save_messages(messages):
+            attempts.append(messages)
+            if len(attempts) == 1:
+                raise DatabaseError("down")
+            return await save(messages)
+
+        message = await self.send_hi(save_messages)
+        self.assertEqual(message["text"], "hi")
+        self.assertEqual(len(attempts), 2)
+
+    async def test_lost_messages_are_reported_to_the_sender(self):
+        save_messages = mock.AsyncMock(side_effect=DatabaseError("down"))
+
+        message = await self.send_hi(save_messages)
+        self.assertEqual(message["type"], "error")
+        self.assertEqual(message["text"], "hi")
+        self.assertEqual(save_messages.await_count, 3)
+        self.assertFalse(await sync_to_async(Message.objects.exists)())
+
+    async def test_outsiders_are_rejected(self):
+        eve, closed = await self.connect(self.users[2])
+        self.assertEqual(closed, {"type": "websocket.close", "code": 4403})
+        alice, closed = await self.connect(self.users[0], "/ws/nowhere")
+        self.assertEqual(closed, {"type": "websocket.close", "code": 4404})
+
+
+class TestInbox(APITestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username="alice")
+        self.bob = User.objects.create(username="bob")
+        self.rooms = [ChattingRoom.objects.create() for i in range(3)]
+        for room in self.rooms:
+            room.users.add(self.alice, self.bob)
+        Message.objects.bulk_create(
+            [
+                Message(room=room, user=user, text=f"{room.pk} {number}")
+                for room in self.rooms
+                for number, user in enumerate((self.bob, self.bob, self.alice))
+            ]
+        )
+        self.client.force_authenticate(self.alice)
+
+    def test_inbox(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/v1/direct-messages/")
+        conversations = response.json()
+        self.assertEqual(
+            [conversation["room"] for conversation in conversations],
+            [room.pk for room in reversed(self.rooms)],
+        )
+        self.assertEqual(conversations[0]["unread"], 2)
+        self.assertEqual(
+            conversations[0]["last_message"]["text"],
+            f"{self.rooms[-1].pk} 2",
+        )
+
+    def test_read(self):
+        room = self.rooms[0]
+        response = self.client.put(f"/api/v1/direct-messages/{room.pk}/read")
+        room.refresh_from_db()
+        self.assertEqual(
+            response.json(),
+            {"last_read_message_id": room.last_message_id},
+        )
+        Message.objects.create(room=room, user=self.bob, text="new")
+        conversations = self.client.get("/api/v1/direct-messages/").json()
+        self.assertEqual(conversations[0]["room"], room.pk)
+        self.assertEqual(conversations[0]["unread"], 1)
+
+    def test_history_is_newest_first(self):
+        room = self.rooms[0]
+        url = f"/api/v1/direct-messages/{room.pk}/messages"
+        with self.settings(LIST_PAGE_SIZE=2):
+            response = self.client.get(url)
+            texts = [message["text"] for message in response.json()]
+            response = self.client.get(
+                url,
+                {"cursor": response["X-Next-Cursor"]},
+            )
+        texts += [message["text"] for message in response.json()]
+        self.assertEqual(texts, [f"{room.pk} {n}" for n in (2, 1, 0)])
+
+    def test_outsiders_get_not_found(self):
+        self.client.force_authenticate(User.objects.create(username="eve"))
+        response = self.client.get(
+            f"/api/v1/direct-messages/{self.rooms[0].pk}/messages"
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class TestArchiveMessages(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="alice")
+        self.room = ChattingRoom.objects.create()
+        self.room.users.add(self.user)
+        self.old = Message.objects.bulk_create(
+            [
+                Message(room=self.room, user=self.user, text=str(number))
+                for number in range(5)
+            ]
+        )
+        Message.objects.filter(pk__in=[m.pk for m in self.old]).update(
+            created_at=datetime.datetime(2020, 1, 31, tzinfo=datetime.timezone.utc),
+        )
+        Message.objects.filter(pk=self.old[-1].pk).update(
+            created_at=datetime.datetime(2020, 2, 1, tzinfo=datetime.timezone.utc),
+        )
+        self.new = Message.objects.create(
+            room=self.room,
+            user=self.user,
+            text="new",
+        )
+
+    def test_archive_old_messages(self):
+        with tempfile.TemporaryDirectory() as root:
+            with self.captureOnCommitCallbacks() as callbacks:
+                call_command(
+                    "archive_messages",
+                    output=root,
+                    batch_size=2,
+                    stdout=open(os.devnull, "w"),
+                )
+            with self.assertNumQueries(1):
+                for callback in callbacks:
+                    callback()
+            self.assertEqual(
+                sorted(os.listdir(root)),
+                ["messages-2020-01.jsonl.gz", "messages-2020-02.jsonl.gz"],
+            )
+            with gzip.open(
+                os.path.join(root, "messages-2020-01.jsonl.gz"), "rt"
+            ) as archive:
+                rows = [json.loads(line) for line in archive]
+        self.assertEqual([row["text"] for row in rows], ["0", "1", "2", "3"])
+        self.assertEqual(
+            list(Message.objects.values_list("pk", flat=True)),
+            [self.new.pk],
+        )
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.last_message_id, self.new.pk)
+
+    def test_archive_needs_a_root(self):
+        with self.settings(MESSAGE_ARCHIVE_ROOT=None):
+            with self.assertRaises(CommandError):
+                call_command("archive_messages", stdout=open(os.devnull, "w"))
+        self.assertEqual(Message.objects.count(), 6)
+
+    def test_deletes_move_last_message_back(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.new.delete()
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.last_message_id, self.old[-1].pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.last_message_id, self.old[-1].pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Message.objects.filter(room=self.room).delete()
+        self.room.refresh_from_db()
+        self.assertIsNone(self.room.last_message_id)
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("", views.Inbox.as_view()),
+    path("<int:pk>/messages", views.ConversationMessages.as_view()),
+    path("<int:pk>/read", views.ConversationRead.as_view()),
+]
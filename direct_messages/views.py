@@ -1,3 +1,98 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, ParseError
+from common.fast_serializers import compiled
+from common.pagination import KeysetPagination
+from .models import Message, Participant
+from .serializers import ConversationSerializer, MessageSerializer
 
-# Create your views here.
+
+def get_participant(pk, user):
+    try:
+        return Participant.objects.select_related("room").get(
+            room=pk,
+            user=user,
+        )
+    except Participant.DoesNotExist:
+        raise NotFound
+
+
+def unread_count():
+    """Messages from others after the participant's last read one."""
+    return Coalesce(
+        Subquery(
+            Message.objects.filter(
+                room=OuterRef("room"),
+                pk__gt=OuterRef("last_read_message_id"),
+            )
+            .exclude(user=OuterRef("user"))
+            .order_by()
+            .values("room")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+class Inbox(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        conversations = (
+            Participant.objects.filter(user=request.user)
+            .select_related("room__last_message__user")
+            .prefetch_related("room__users")
+            .annotate(unread=unread_count())
+            .order_by(
+                F("room__last_message").desc(nulls_last=True),
+                "-room",
+            )
+        )
+        serializer = ConversationSerializer(conversations, many=True)
+        return Response(serializer.data)
+
+
+class ConversationMessages(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        participant = get_participant(pk, request.user)
+        serializer = compiled(MessageSerializer)
+        paginator = KeysetPagination(
+            page_size=settings.LIST_PAGE_SIZE,
+            descending=True,
+        )
+        messages = paginator.paginate_queryset(
+            serializer.values(participant.room.messages.all()),
+            request,
+        )
+        return paginator.get_paginated_response(serializer.serialize(messages))
+
+
+class ConversationRead(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, pk):
+        participant = get_participant(pk, request.user)
+        last_message_id = participant.room.last_message_id or 0
+        message_id = request.data.get("message", last_message_id)
+        try:
+            message_id = min(int(message_id), last_message_id)
+        except (TypeError, ValueError):
+            raise ParseError("Invalid message")
+        # Only ever forward, a stale tab can't mark messages unread again
+        Participant.objects.filter(
+            pk=participant.pk,
+            last_read_message_id__lt=message_id,
+        ).update(last_read_message_id=message_id)
+        return Response(
+            {"last_read_message_id": max(message_id, participant.last_read_message_id)}
+        )
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from common import metrics
+from .models import Message
+from .serializers import MessageSerializer
+
+logger = logging.getLogger(__name__)
+
+
+@sync_to_async
+def save_messages(messages):
+    with metrics.timer("direct_messages.save"), transaction.atomic():
+        messages = Message.objects.bulk_create(messages)
+    return [
+        {"type": "message", **MessageSerializer(message).data} for message in messages
+    ]
+
+
+class MessageWriter:
+
+    """Saves chat messages with one bulk_create per batch, then fans out
+
+    Messages are published only once they have a pk. A flush runs at most
+    every CHAT_FLUSH_INTERVAL seconds, or right away when a full batch is
+    waiting, and senders wait while CHAT_MAX_PENDING messages are queued.
+    A batch that can't be saved is tried CHAT_SAVE_ATTEMPTS times, then
+    its senders get an error with the text of each lost message.
+    """
+
+    def __init__(self, get_pubsub):
+        self.get_pubsub = get_pubsub
+        self.pending = []
+        self.task = None
+
+    async def submit(self, room_pk, user, text, subscription):
+        while len(self.pending) >= settings.CHAT_MAX_PENDING:
+            await asyncio.shield(self.start())
+        self.pending.append(
+            (Message(room_id=room_pk, user=user, text=text), subscription)
+        )
+        metrics.gauge("direct_messages.pending", len(self.pending))
+        self.start()
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return self.task
+
+    async def run(self):
+        while self.pending:
+            if len(self.pending) < settings.CHAT_BATCH_SIZE:
+                await asyncio.sleep(settings.CHAT_FLUSH_INTERVAL)
+            batch = self.pending[: settings.CHAT_BATCH_SIZE]
+            self.pending = self.pending[settings.CHAT_BATCH_SIZE :]
+            payloads = await self.save(batch)
+            if payloads is None:
+                for message, subscription in batch:
+                    subscription.deliver(
+                        {
+                            "type": "error",
+                            "error": "Could not send the message",
+                            "text": message.text,
+                        }
+                    )
+                continue
+            pubsub = self.get_pubsub()
+            for payload in payloads:
+                await pubsub.publish(payload["room"], payload)
+
+    async def save(self, batch):
+        messages = [message for message, subscription in batch]
+        for attempt in range(settings.CHAT_SAVE_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(settings.CHAT_FLUSH_INTERVAL * 2**attempt)
+            try:
+                return await save_messages(messages)
+            except Exception:
+                logger.exception("Could not save %d messages", len(messages))
+                metrics.increment("direct_messages.save_failures")
+        return None
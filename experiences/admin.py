@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Experience, Perk
+from .models import Experience, ExperienceSlot, Perk
 
 
 @admin.register(Experience)
@@ -16,6 +16,17 @@ class ExperienceAdmin(admin.ModelAdmin):
     list_filter = ("category",)
 
 
+@admin.register(ExperienceSlot)
+class ExperienceSlotAdmin(admin.ModelAdmin):
+
+    list_display = (
+        "experience",
+        "start",
+        "capacity",
+        "remaining",
+    )
+
+
 @admin.register(Perk)
 class PerkAdmin(admin.ModelAdmin):
 
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "experiences",
+            "0003_alter_experience_category_alter_experience_host_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experience",
+            name="rating_avg",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="experience",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="experience",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
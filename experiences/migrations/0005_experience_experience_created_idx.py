@@ -0,0 +1,19 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0004_experience_rating_avg_experience_rating_sum_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="experience",
+            index=models.Index(
+                fields=["created_at", "id"], name="experience_created_idx"
+            ),
+        ),
+    ]
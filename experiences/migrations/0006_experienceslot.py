@@ -0,0 +1,62 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0005_experience_experience_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experience",
+            name="capacity",
+            field=models.PositiveIntegerField(default=10),
+        ),
+        migrations.CreateModel(
+            name="ExperienceSlot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("start", models.DateTimeField()),
+                ("capacity", models.PositiveIntegerField()),
+                ("remaining", models.PositiveIntegerField()),
+                (
+                    "experience",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slots",
+                        to="experiences.experience",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="experienceslot",
+            constraint=models.UniqueConstraint(
+                fields=("experience", "start"), name="experience_slot_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="experienceslot",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    ("remaining__lte", django.db.models.expressions.F("capacity"))
+                ),
+                name="experience_slot_remaining_lte_capacity",
+            ),
+        ),
+    ]
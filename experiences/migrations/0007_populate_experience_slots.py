@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Sum
+
+
+def populate_slots(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    Experience = apps.get_model("experiences", "Experience")
+    ExperienceSlot = apps.get_model("experiences", "ExperienceSlot")
+    capacities = dict(Experience.objects.values_list("pk", "capacity"))
+    sessions = (
+        Booking.objects.filter(
+            kind="experience",
+            experience__isnull=False,
+            experience_time__isnull=False,
+        )
+        .order_by()
+        .values("experience", "experience_time")
+        .annotate(guests=Sum("guests"))
+    )
+    slots = []
+    for session in sessions:
+        # Sessions booked past the default capacity start out full
+        capacity = max(capacities[session["experience"]], session["guests"])
+        slots.append(
+            ExperienceSlot(
+                experience_id=session["experience"],
+                start=session["experience_time"],
+                capacity=capacity,
+                remaining=capacity - session["guests"],
+            )
+        )
+    ExperienceSlot.objects.bulk_create(slots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_populate_occupancy"),
+        ("experiences", "0006_experienceslot"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_slots, migrations.RunPython.noop),
+    ]
@@ -29,6 +29,7 @@ class Experience(CommonModel):
     )
     start = models.TimeField()
     end = models.TimeField()
+    capacity = models.PositiveIntegerField(default=10)
     description = models.TextField()
     perks = models.ManyToManyField(
         "experiences.Perk",
@@ -41,6 +42,26 @@ class Experience(CommonModel):
         on_delete=models.SET_NULL,
         related_name="experiences",
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_avg = models.FloatField(
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="experience_created_idx",
+            ),
+        ]
 
     def hour(experience):
         start = experience.start
@@ -58,21 +79,41 @@ class Experience(CommonModel):
         return f"{datetime_diff_in_hour} 시간"
 
     def rating(experience):
-        reviews = experience.reviews.all().values("rating")
-        reviews_count = reviews.count()
-        if reviews_count == 0:
-            return 0
-        else:
-            total_rating = 0
-            for review in reviews:
-                total_rating += review["rating"]
-            rating_average = round(total_rating / reviews_count)
-            return rating_average
+        return round(experience.rating_avg)
 
     def __str__(self) -> str:
         return self.name
 
 
+class ExperienceSlot(CommonModel):
+
+    """Seats of one session of an Experience"""
+
+    experience = models.ForeignKey(
+        "experiences.Experience",
+        on_delete=models.CASCADE,
+        related_name="slots",
+    )
+    start = models.DateTimeField()
+    capacity = models.PositiveIntegerField()
+    remaining = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["experience", "start"],
+                name="experience_slot_unique",
+            ),
+            models.CheckConstraint(
+                check=models.Q(remaining__lte=models.F("capacity")),
+                name="experience_slot_remaining_lte_capacity",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.experience} / {self.start}"
+
+
 class Perk(CommonModel):
 
     """What is included on an Experience"""
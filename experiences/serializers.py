@@ -1,9 +1,10 @@
 from rest_framework import serializers
 import datetime
-from .models import Perk, Experience
+from .models import Perk, Experience, ExperienceSlot
 from medias.serializers import PhotoSerializer, VideoSerializer
 from users.serializers import TinyUserSerializer
 from categories.serializers import CategorySerializer
+from wishlists.likes import liked_experience_pks
 
 
 class PerkSerializer(serializers.ModelSerializer):
@@ -17,6 +18,16 @@ class PerkSerializer(serializers.ModelSerializer):
         )
 
 
+class ExperienceSlotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExperienceSlot
+        fields = (
+            "start",
+            "capacity",
+            "remaining",
+        )
+
+
 class ExperienceListSerializer(serializers.ModelSerializer):
 
     photos = PhotoSerializer(read_only=True, many=True)
@@ -40,6 +51,7 @@ class ExperienceListSerializer(serializers.ModelSerializer):
             "is_owner",
             "is_liked",
         )
+        row_values = ("rating_avg", "host_id", "start", "end")
 
     def get_rating(self, experience):
         return experience.rating()
@@ -48,18 +60,16 @@ class ExperienceListSerializer(serializers.ModelSerializer):
         return experience.hour()
 
     def get_is_owner(self, experience):
-        request = self.context["request"]
-        return request.user == experience.host
+        request = self.context.get("request")
+        if request:
+            return experience.host_id == request.user.pk
+        return False
 
     def get_is_liked(self, experience):
-        try:
-            request = self.context["request"]
-            return experience.wishlists.filter(
-                experiences__pk=experience.pk,
-                user=request.user,
-            ).exists()
-        except:
-            return False
+        request = self.context.get("request")
+        if request:
+            return experience.pk in liked_experience_pks(request)
+        return False
 
 
 class ExperienceDetailSerializer(serializers.ModelSerializer):
@@ -99,6 +109,7 @@ class ExperienceDetailSerializer(serializers.ModelSerializer):
             "price",
             "start",
             "end",
+            "capacity",
             "description",
             "address",
             "hour",
@@ -117,15 +128,13 @@ class ExperienceDetailSerializer(serializers.ModelSerializer):
         return experience.hour()
 
     def get_is_owner(self, experience):
-        request = self.context["request"]
-        return request.user == experience.host
+        request = self.context.get("request")
+        if request:
+            return experience.host_id == request.user.pk
+        return False
 
     def get_is_liked(self, experience):
-        try:
-            request = self.context["request"]
-            return experience.wishlists.filter(
-                experiences__pk=experience.pk,
-                user=request.user,
-            ).exists()
-        except:
-            return False
+        request = self.context.get("request")
+        if request:
+            return experience.pk in liked_experience_pks(request)
+        return False
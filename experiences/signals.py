@@ -0,0 +1,37 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from common.cache import invalidate, invalidate_namespace
+from .models import Experience, Perk
+from .slots import resize
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def invalidate_experience(sender, instance, **kwargs):
+    invalidate("experiences", instance.pk)
+
+
+@receiver(post_save, sender=Experience)
+def resize_slots(sender, instance, created, **kwargs):
+    if not created:
+        resize(instance)
+
+
+@receiver(post_save, sender=Perk)
+@receiver(post_delete, sender=Perk)
+def invalidate_perks(sender, instance, **kwargs):
+    invalidate_namespace("perks")
+    invalidate_namespace("experiences")
+
+
+@receiver(m2m_changed, sender=Experience.perks.through)
+def invalidate_experience_perks(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate("experiences", instance.pk)
+    elif pk_set:
+        for pk in pk_set:
+            invalidate("experiences", pk)
+    else:
+        invalidate_namespace("experiences")
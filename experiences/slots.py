@@ -0,0 +1,57 @@
+from django.db.models import F
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+from .models import ExperienceSlot
+
+
+class SoldOut(Exception):
+    pass
+
+
+def get_slot(experience, start):
+    slot, created = ExperienceSlot.objects.get_or_create(
+        experience=experience,
+        start=start,
+        defaults={
+            "capacity": experience.capacity,
+            "remaining": experience.capacity,
+        },
+    )
+    return slot
+
+
+def reserve(experience, start, guests):
+    """Take guests seats of a session, False when there aren't enough.
+
+    The check and the decrement are one conditional UPDATE, so concurrent
+    bookings can't both take the last seats and no row lock is needed.
+    Call it in the transaction that saves the booking.
+    """
+    slot = get_slot(experience, start)
+    return bool(
+        ExperienceSlot.objects.filter(
+            pk=slot.pk,
+            remaining__gte=guests,
+        ).update(remaining=F("remaining") - guests)
+    )
+
+
+def release(experience_pk, start, guests):
+    ExperienceSlot.objects.filter(experience=experience_pk, start=start).update(
+        remaining=Least(F("remaining") + guests, F("capacity"))
+    )
+
+
+def resize(experience):
+    """Move the upcoming sessions of an experience to its capacity.
+
+    Seats already taken stay taken, so remaining moves by the difference
+    and bottoms out at 0 when the capacity shrinks below the bookings.
+    """
+    ExperienceSlot.objects.filter(
+        experience=experience,
+        start__gte=timezone.now(),
+    ).exclude(capacity=experience.capacity).update(
+        capacity=experience.capacity,
+        remaining=Greatest(F("remaining") + experience.capacity - F("capacity"), 0),
+    )
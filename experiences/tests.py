@@ -1,3 +1,130 @@
-from django.test import TestCase
+import datetime
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from bookings.models import Booking
+from users.models import User
+from .models import Experience, ExperienceSlot
+from .slots import SoldOut
 
-# Create your tests here.
+
+class TestExperienceSlots(APITestCase):
+    def setUp(self):
+        self.host = User.objects.create(username="host")
+        self.guest = User.objects.create(username="guest")
+        self.experience = Experience.objects.create(
+            name="Experience",
+            host=self.host,
+            price=100,
+            address="Address",
+            start=datetime.time(10),
+            end=datetime.time(12),
+            capacity=3,
+            description="Description",
+        )
+        self.year = timezone.localtime(timezone.now()).year + 1
+        self.time = timezone.make_aware(datetime.datetime(self.year, 1, 10, 10))
+        self.client.force_login(self.guest)
+
+    def book(self, guests):
+        return self.client.post(
+            f"/api/v1/experiences/{self.experience.pk}/bookings",
+            data={"experience_time": self.time, "guests": guests},
+        )
+
+    def test_seats_are_reserved_until_full(self):
+        response = self.book(2)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        response = self.book(1)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        response = self.book(1)
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+        self.assertEqual(Booking.objects.count(), 2)
+
+        response = self.client.get(
+            f"/api/v1/experiences/{self.experience.pk}/slots",
+            data={"year": self.year, "month": 1},
+        )
+        slots = response.json()
+        self.assertEqual(len(slots), 1)
+        self.assertEqual(slots[0]["capacity"], 3)
+        self.assertEqual(slots[0]["remaining"], 0)
+
+    def test_cancel_releases_seats(self):
+        self.book(2)
+        Booking.objects.get().delete()
+        slot = ExperienceSlot.objects.get()
+        self.assertEqual(slot.remaining, 3)
+
+    def test_edits_move_the_seats(self):
+        booking = Booking.objects.create(
+            kind=Booking.BookingKindChoices.EXPERIENCE,
+            user=self.guest,
+            experience=self.experience,
+            experience_time=self.time,
+            guests=1,
+        )
+        self.assertEqual(ExperienceSlot.objects.get().remaining, 2)
+
+        booking.guests = 3
+        booking.save()
+        self.assertEqual(ExperienceSlot.objects.get().remaining, 0)
+
+        booking.experience_time = self.time + datetime.timedelta(days=1)
+        booking.save()
+        slots = ExperienceSlot.objects.order_by("start")
+        self.assertEqual([slot.remaining for slot in slots], [3, 0])
+
+    def test_full_session_rejects_edits(self):
+        self.book(3)
+        booking = Booking.objects.create(
+            kind=Booking.BookingKindChoices.EXPERIENCE,
+            user=self.guest,
+            experience=self.experience,
+            experience_time=self.time + datetime.timedelta(days=1),
+            guests=1,
+        )
+
+        booking.experience_time = self.time
+        with self.assertRaises(SoldOut):
+            booking.save()
+        booking.refresh_from_db()
+        self.assertEqual(
+            booking.experience_time, self.time + datetime.timedelta(days=1)
+        )
+        slots = ExperienceSlot.objects.order_by("start")
+        self.assertEqual([slot.remaining for slot in slots], [0, 2])
+
+    def test_capacity_changes_resize_upcoming_slots(self):
+        self.book(2)
+        past = ExperienceSlot.objects.create(
+            experience=self.experience,
+            start=self.time.replace(year=self.year - 2),
+            capacity=3,
+            remaining=3,
+        )
+
+        self.experience.capacity = 5
+        self.experience.save()
+        slot = ExperienceSlot.objects.get(start=self.time)
+        self.assertEqual((slot.capacity, slot.remaining), (5, 3))
+
+        self.experience.capacity = 1
+        self.experience.save()
+        slot.refresh_from_db()
+        self.assertEqual((slot.capacity, slot.remaining), (1, 0))
+
+        past.refresh_from_db()
+        self.assertEqual((past.capacity, past.remaining), (3, 3))
+
+    def test_only_the_host_sees_the_guests(self):
+        self.book(2)
+        url = f"/api/v1/experiences/{self.experience.pk}/calendar"
+        params = {"year": self.year, "month": 1}
+
+        days = self.client.get(url, data=params).json()["days"]
+        self.assertEqual(len(days), 1)
+        self.assertNotIn("guests", days[0])
+
+        self.client.force_login(self.host)
+        days = self.client.get(url, data=params).json()["days"]
+        self.assertEqual(days[0]["guests"], 2)
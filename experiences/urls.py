@@ -9,6 +9,8 @@ urlpatterns = [
     path("<int:pk>/photos", views.ExperiencePhotos.as_view()),
     path("<int:pk>/video", views.ExperienceVideo.as_view()),
     path("<int:pk>/bookings", views.ExperienceBookings.as_view()),
+    path("<int:pk>/calendar", views.ExperienceCalendar.as_view()),
+    path("<int:pk>/slots", views.ExperienceSlots.as_view()),
     path("perks/", views.Perks.as_view()),
     path("perks/<int:pk>", views.PerkDetail.as_view()),
 ]
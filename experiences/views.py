@@ -1,5 +1,4 @@
 import datetime
-import pytz
 from django.db import transaction
 from django.conf import settings
 from django.utils import timezone
@@ -14,6 +13,12 @@ from rest_framework.permissions import (
 from .models import Perk, Experience
 from . import serializers
 from categories.models import Category
+from common.cache import cached
+from common.conditional import get_list_stamp, get_stamp
+from common.fast_serializers import compiled, fast_data
+from common.m2m import sync_m2m
+from common.pagination import KeysetPagination
+from common.streaming import StreamingJSONResponse, wants_stream
 from reviews.serializers import ReviewSerializer
 from medias.serializers import PhotoSerializer, VideoSerializer
 from bookings.serializers import (
@@ -21,13 +26,29 @@ from bookings.serializers import (
     CreateExperienceBookingSerializer,
 )
 from bookings.models import Booking
+from bookings.calendar import get_booking_pks, get_calendar, parse_months
+from medias.models import Photo
+from wishlists.likes import liked_experience_pks
 
 
 class Perks(APIView):
     def get(self, request):
-        all_perks = Perk.objects.all()
-        serializer = serializers.PerkSerializer(all_perks, many=True)
-        return Response(serializer.data)
+        stamp = cached(
+            lambda: get_list_stamp(Perk.objects.all()),
+            "perks",
+            "stamp",
+        )
+        response = stamp.not_modified(request)
+        if response is not None:
+            return response
+        data = cached(
+            lambda: serializers.PerkSerializer(
+                Perk.objects.all(),
+                many=True,
+            ).data,
+            "perks",
+        )
+        return stamp.apply(Response(data))
 
     def post(self, request):
         serializer = serializers.PerkSerializer(request.data)
@@ -74,15 +95,21 @@ class Experiences(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request):
-        experiences = Experience.objects.all()
-        serializer = serializers.ExperienceListSerializer(
-            experiences,
-            many=True,
-            context={
-                "request": request,
-            },
+        serializer = compiled(serializers.ExperienceListSerializer)
+        if wants_stream(request):
+            return StreamingJSONResponse(
+                Experience.objects.all(),
+                serializer,
+                context={"request": request},
+            )
+        paginator = KeysetPagination(page_size=settings.LIST_PAGE_SIZE)
+        experiences = paginator.paginate_queryset(
+            serializer.values(Experience.objects.all(), "created_at"),
+            request,
+        )
+        return paginator.get_paginated_response(
+            serializer.serialize(experiences, {"request": request})
         )
-        return Response(serializer.data)
 
     def post(self, request):
         serializer = serializers.ExperienceDetailSerializer(
@@ -98,23 +125,21 @@ class Experiences(APIView):
                     raise ParseError("Category kind have to be an experience")
             except Category.DoesNotExist:
                 raise NotFound
-            try:
-                with transaction.atomic():
-                    experience = serializer.save(
-                        host=request.user,
-                        category=category,
-                    )
-                    perks = request.data.get("perks")
-                    for perk_pk in perks:
-                        perk = Perk.objects.get(pk=perk_pk)
-                        experience.perks.add(perk)
-                    serializer = serializers.ExperienceDetailSerializer(
-                        experience,
-                        context={"request": request},
-                    )
-                    return Response(serializer.data)
-            except Exception:
-                raise ParseError("Perk not found")
+            with transaction.atomic():
+                experience = serializer.save(
+                    host=request.user,
+                    category=category,
+                )
+                sync_m2m(
+                    experience.perks,
+                    request.data.get("perks", []),
+                    ParseError("Perk not found"),
+                )
+            serializer = serializers.ExperienceDetailSerializer(
+                experience,
+                context={"request": request},
+            )
+            return Response(serializer.data)
         else:
             return Response(serializer.errors)
 
@@ -129,7 +154,7 @@ class ExperienceDetail(APIView):
         except:
             raise NotFound
 
-    def get(self, request, pk):
+    def serialize(self, request, pk):
         experience = self.get_object(pk)
         serializer = serializers.ExperienceDetailSerializer(
             experience,
@@ -137,7 +162,55 @@ class ExperienceDetail(APIView):
                 "request": request,
             },
         )
-        return Response(serializer.data)
+        return serializer.data
+
+    def get_stamp(self, request, pk):
+        extra = ()
+        if request.user.is_authenticated:
+            extra = (request.user.pk, pk in liked_experience_pks(request))
+        stamp = get_stamp(
+            Experience.objects.filter(pk=pk),
+            (
+                "updated_at",
+                "rating_sum",
+                "review_count",
+                "category__updated_at",
+                "video__pk",
+                "video__updated_at",
+                "host__name",
+                "host__avatar",
+                "host__username",
+            ),
+            {
+                "photos": (Photo.objects.all(), "experience"),
+                "perks": (Perk.objects.all(), "experiences"),
+            },
+            extra,
+        )
+        if stamp is None:
+            raise NotFound
+        return stamp
+
+    def get(self, request, pk):
+        if request.user.is_authenticated:
+            stamp = self.get_stamp(request, pk)
+            data = None
+        else:
+            # Cached together, so a hit answers without a query
+            stamp, data = cached(
+                lambda: (
+                    self.get_stamp(request, pk),
+                    self.serialize(request, pk),
+                ),
+                "experiences",
+                pk,
+            )
+        response = stamp.not_modified(request)
+        if response is not None:
+            return response
+        if data is None:
+            data = self.serialize(request, pk)
+        return stamp.apply(Response(data))
 
     def put(self, request, pk):
         experience = self.get_object(pk)
@@ -150,28 +223,27 @@ class ExperienceDetail(APIView):
         )
         if serializer.is_valid():
             category_pk = request.data.get("category")
-            if category_pk:
-                try:
-                    category = Category.objects.get(pk=category_pk)
-                    if category.kind == Category.CategoryKindChoices.ROOMS:
-                        raise ParseError(
-                            "The category should have kind of experience"
-                        )
-                    experience = serializer.save(category=category)
-                except Category.DoesNotExist:
-                    raise NotFound
-            else:
-                experience = serializer.save()
-
-            perks = request.data.get("perks")
-            if perks:
-                experience.perks.clear()
-                for perk_pk in perks:
+            with transaction.atomic():
+                if category_pk:
                     try:
-                        perk = Perk.objects.get(pk=perk_pk)
-                        experience.perks.add(perk)
-                    except Perk.DoesNotExist:
-                        raise NotFound("Perks not updated correctly")
+                        category = Category.objects.get(pk=category_pk)
+                        if category.kind == Category.CategoryKindChoices.ROOMS:
+                            raise ParseError(
+                                "The category should have kind of experience"
+                            )
+                        experience = serializer.save(category=category)
+                    except Category.DoesNotExist:
+                        raise NotFound
+                else:
+                    experience = serializer.save()
+
+                perks = request.data.get("perks")
+                if perks is not None:
+                    sync_m2m(
+                        experience.perks,
+                        perks,
+                        NotFound("Perks not updated correctly"),
+                    )
 
             serializer = serializers.ExperienceDetailSerializer(
                 experience,
@@ -197,22 +269,14 @@ class ExperiencePerks(APIView):
             raise NotFound
 
     def get(self, request, pk):
-
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except:
-            page = 1
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
         experience = self.get_object(pk)
-        perks = experience.perks.all()[start:end]
+        paginator = KeysetPagination()
+        perks = paginator.paginate_queryset(experience.perks.all(), request)
         serializer = serializers.PerkSerializer(
             perks,
             many=True,
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class ExperienceReviews(APIView):
@@ -223,18 +287,14 @@ class ExperienceReviews(APIView):
             raise NotFound
 
     def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except:
-            page = 1
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
         experience = self.get_object(pk)
-        reviews = experience.reviews.all()[start:end]
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
+        serializer = compiled(ReviewSerializer)
+        paginator = KeysetPagination()
+        reviews = paginator.paginate_queryset(
+            serializer.values(experience.reviews.all(), "created_at"),
+            request,
+        )
+        return paginator.get_paginated_response(serializer.serialize(reviews))
 
 
 class ExperiencePhotos(APIView):
@@ -294,32 +354,12 @@ class ExperienceBookings(APIView):
             raise NotFound
 
     def get(self, request, pk):
-        now = timezone.localtime(timezone.now())
-        try:
-            month = int(request.query_params.get("month", now.month))
-            year = int(request.query_params.get("year", now.year))
-            if year < now.year:
-                year = now.year
-                month = now.month
-            if (year == now.year) and (month < now.month):
-                month = now.month
-        except:
-            month = now.month
-            year = now.year
-        start = datetime.datetime(year, month, 1, tzinfo=pytz.UTC)
-        if month == 12:
-            end = datetime.datetime(year + 1, 1, 1, tzinfo=pytz.UTC)
-        else:
-            end = datetime.datetime(year, month + 1, 1, tzinfo=pytz.UTC)
-
+        start, end = parse_months(request)
         experience = self.get_object(pk)
-        bookings = experience.bookings.filter(
-            kind=Booking.BookingKindChoices.EXPERIENCE,
-            experience_time__gte=start,
-            experience_time__lt=end,
+        bookings = Booking.objects.filter(
+            pk__in=get_booking_pks(start, end, experience=experience)
         )
-        serializer = PublicBookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+        return Response(fast_data(PublicBookingSerializer, bookings))
 
     def post(self, request, pk):
         experience = self.get_object(pk)
@@ -337,3 +377,47 @@ class ExperienceBookings(APIView):
             return Response(serializer.data)
         else:
             return Response(serializer.errors)
+
+
+class ExperienceCalendar(APIView):
+    def get_object(self, pk):
+        try:
+            return Experience.objects.get(pk=pk)
+        except Experience.DoesNotExist:
+            raise NotFound
+
+    def get(self, request, pk):
+        start, end = parse_months(request)
+        experience = self.get_object(pk)
+        days = get_calendar(start, end, experience=experience)
+        if experience.host_id != request.user.pk:
+            for day in days:
+                del day["guests"]
+        return Response(
+            {
+                "start": start,
+                "end": end - datetime.timedelta(days=1),
+                "days": days,
+            }
+        )
+
+
+class ExperienceSlots(APIView):
+    def get_object(self, pk):
+        try:
+            return Experience.objects.get(pk=pk)
+        except Experience.DoesNotExist:
+            raise NotFound
+
+    def get(self, request, pk):
+        start, end = parse_months(request)
+        experience = self.get_object(pk)
+        slots = experience.slots.filter(
+            start__gte=timezone.make_aware(
+                datetime.datetime.combine(start, datetime.time.min)
+            ),
+            start__lt=timezone.make_aware(
+                datetime.datetime.combine(end, datetime.time.min)
+            ),
+        ).order_by("start")
+        return Response(fast_data(serializers.ExperienceSlotSerializer, slots))
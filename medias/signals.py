@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from common.cache import invalidate
+from .models import Photo, Video
+
+
+@receiver(post_save, sender=Photo)
+@receiver(post_delete, sender=Photo)
+def invalidate_photo_owner(sender, instance, **kwargs):
+    if instance.room_id:
+        invalidate("rooms", instance.room_id)
+    if instance.experience_id:
+        invalidate("experiences", instance.experience_id)
+
+
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def invalidate_video_owner(sender, instance, **kwargs):
+    invalidate("experiences", instance.experience_id)
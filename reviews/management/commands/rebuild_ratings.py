@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+
+    help = "Rebuild the stored rating aggregates of rooms and experiences"
+
+    def handle(self, *args, **options):
+        Review.objects.refresh_ratings()
+        self.stdout.write(self.style.SUCCESS("Ratings rebuilt."))
@@ -0,0 +1,40 @@
+from django.db import migrations
+from django.db.models import Avg, Count, Sum
+
+
+def populate_ratings(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    for field, model_name in (
+        ("room", "rooms.Room"),
+        ("experience", "experiences.Experience"),
+    ):
+        model = apps.get_model(model_name)
+        aggregates = (
+            Review.objects.filter(**{f"{field}__isnull": False})
+            .order_by()
+            .values(field)
+            .annotate(
+                total=Sum("rating"),
+                count=Count("pk"),
+                average=Avg("rating"),
+            )
+        )
+        for aggregate in aggregates:
+            model.objects.filter(pk=aggregate[field]).update(
+                rating_sum=aggregate["total"],
+                review_count=aggregate["count"],
+                rating_avg=aggregate["average"],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0004_experience_rating_avg_experience_rating_sum_and_more"),
+        ("rooms", "0007_room_rating_avg_room_rating_sum_room_review_count"),
+        ("reviews", "0002_alter_review_experience_alter_review_room_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_ratings, migrations.RunPython.noop),
+    ]
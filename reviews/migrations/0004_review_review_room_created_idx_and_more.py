@@ -0,0 +1,32 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0003_populate_ratings"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["room", "created_at", "id"], name="review_room_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["experience", "created_at", "id"],
+                name="review_experience_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="review_user_created_idx"
+            ),
+        ),
+    ]
@@ -1,7 +1,111 @@
 from django.db import models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from common.cache import invalidate, invalidate_namespace
 from common.models import CommonModel
 
 
+class ReviewQuerySet(models.QuerySet):
+
+    """Keeps the rating aggregates of rooms and experiences up to date"""
+
+    TARGET_FIELDS = (
+        "room",
+        "room_id",
+        "experience",
+        "experience_id",
+        "rating",
+    )
+
+    def targets(self):
+        room_pks = set()
+        experience_pks = set()
+        for room_pk, experience_pk in self.values_list(
+            "room_id",
+            "experience_id",
+        ):
+            room_pks.add(room_pk)
+            experience_pks.add(experience_pk)
+        room_pks.discard(None)
+        experience_pks.discard(None)
+        return room_pks, experience_pks
+
+    def refresh_ratings(self, room_pks=None, experience_pks=None):
+        """Recompute the stored aggregates, None means every row."""
+        for field, pks in (
+            ("room", room_pks),
+            ("experience", experience_pks),
+        ):
+            if pks is not None and not pks:
+                continue
+            targets = self.model._meta.get_field(field).related_model.objects.all()
+            if pks is not None:
+                targets = targets.filter(pk__in=pks)
+            reviews = (
+                self.model.objects.filter(**{field: OuterRef("pk")})
+                .order_by()
+                .values(field)
+            )
+            targets.update(
+                rating_sum=Coalesce(
+                    Subquery(reviews.annotate(total=Sum("rating")).values("total")),
+                    0,
+                    output_field=models.PositiveIntegerField(),
+                ),
+                review_count=Coalesce(
+                    Subquery(reviews.annotate(count=Count("pk")).values("count")),
+                    0,
+                    output_field=models.PositiveIntegerField(),
+                ),
+                rating_avg=Coalesce(
+                    Subquery(reviews.annotate(average=Avg("rating")).values("average")),
+                    0.0,
+                    output_field=models.FloatField(),
+                ),
+            )
+            if pks is None:
+                invalidate_namespace(f"{field}s")
+            else:
+                for pk in pks:
+                    invalidate(f"{field}s", pk)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        reviews = super().bulk_create(objs, *args, **kwargs)
+        self.refresh_ratings(
+            {review.room_id for review in reviews} - {None},
+            {review.experience_id for review in reviews} - {None},
+        )
+        return reviews
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if not set(fields) & set(self.TARGET_FIELDS):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        room_pks, experience_pks = self.filter(
+            pk__in=[review.pk for review in objs]
+        ).targets()
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self.refresh_ratings(
+            room_pks | ({review.room_id for review in objs} - {None}),
+            experience_pks | ({review.experience_id for review in objs} - {None}),
+        )
+        return rows
+
+    def update(self, **kwargs):
+        if not set(kwargs) & set(self.TARGET_FIELDS):
+            return super().update(**kwargs)
+        pks = list(self.values_list("pk", flat=True))
+        room_pks, experience_pks = self.targets()
+        rows = super().update(**kwargs)
+        new_room_pks, new_experience_pks = self.model.objects.filter(
+            pk__in=pks
+        ).targets()
+        self.refresh_ratings(
+            room_pks | new_room_pks,
+            experience_pks | new_experience_pks,
+        )
+        return rows
+
+
 class Review(CommonModel):
 
     """Review from a User to a Room or Experience"""
@@ -28,5 +132,23 @@ class Review(CommonModel):
     payload = models.TextField()
     rating = models.PositiveBigIntegerField()
 
+    objects = ReviewQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "created_at", "id"],
+                name="review_room_created_idx",
+            ),
+            models.Index(
+                fields=["experience", "created_at", "id"],
+                name="review_experience_created_idx",
+            ),
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="review_user_created_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.user} / {self.rating}"
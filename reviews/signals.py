@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .models import Review
+
+
+@receiver(pre_save, sender=Review)
+def remember_targets(sender, instance, **kwargs):
+    if instance.pk:
+        instance._previous_targets = Review.objects.filter(pk=instance.pk).targets()
+    else:
+        instance._previous_targets = (set(), set())
+
+
+@receiver(post_save, sender=Review)
+def refresh_saved_ratings(sender, instance, **kwargs):
+    room_pks, experience_pks = getattr(
+        instance,
+        "_previous_targets",
+        (set(), set()),
+    )
+    Review.objects.refresh_ratings(
+        (room_pks | {instance.room_id}) - {None},
+        (experience_pks | {instance.experience_id}) - {None},
+    )
+
+
+@receiver(post_delete, sender=Review)
+def refresh_deleted_ratings(sender, instance, **kwargs):
+    Review.objects.refresh_ratings(
+        {instance.room_id} - {None},
+        {instance.experience_id} - {None},
+    )
@@ -1,3 +1,59 @@
 from django.test import TestCase
+from rooms.models import Room
+from users.models import User
+from .models import Review
 
-# Create your tests here.
+
+class TestRatingAggregates(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = Room.objects.create(
+            name="Test Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            address="Test Address",
+            kind=Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+
+    def create_review(self, rating):
+        return Review.objects.create(
+            user=self.user,
+            room=self.room,
+            payload="review",
+            rating=rating,
+        )
+
+    def assertRating(self, rating_sum, review_count, rating):
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.rating_sum, rating_sum)
+        self.assertEqual(self.room.review_count, review_count)
+        self.assertEqual(self.room.rating(), rating)
+
+    def test_create_update_delete(self):
+        review = self.create_review(5)
+        self.create_review(2)
+        self.assertRating(7, 2, 3.5)
+
+        review.rating = 3
+        review.save()
+        self.assertRating(5, 2, 2.5)
+
+        review.delete()
+        self.assertRating(2, 1, 2)
+
+    def test_bulk_paths(self):
+        Review.objects.bulk_create(
+            [
+                Review(user=self.user, room=self.room, payload="a", rating=4),
+                Review(user=self.user, room=self.room, payload="b", rating=1),
+            ]
+        )
+        self.assertRating(5, 2, 2.5)
+
+        Review.objects.filter(room=self.room).update(rating=3)
+        self.assertRating(6, 2, 3)
+
+        Review.objects.filter(room=self.room).delete()
+        self.assertRating(0, 0, 0)
@@ -0,0 +1,86 @@
+import datetime
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ParseError
+from bookings.models import Booking
+from .models import Room
+
+
+def parse_int(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ParseError(f"{name} should be a number.")
+
+
+def parse_date(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ParseError(f"{name} should be a YYYY-MM-DD date.")
+
+
+def filter_rooms(rooms, params):
+    """Narrow a room queryset with the search query parameters."""
+    for name in ("city", "country"):
+        if params.get(name):
+            rooms = rooms.filter(**{name: params[name]})
+
+    min_price = parse_int(params, "min_price")
+    if min_price is not None:
+        rooms = rooms.filter(price__gte=min_price)
+    max_price = parse_int(params, "max_price")
+    if max_price is not None:
+        rooms = rooms.filter(price__lte=max_price)
+
+    kind = params.get("kind")
+    if kind:
+        if kind not in Room.RoomKindChocies.values:
+            raise ParseError("kind is not valid.")
+        rooms = rooms.filter(kind=kind)
+
+    pet_friendly = params.get("pet_friendly")
+    if pet_friendly:
+        if pet_friendly.lower() not in ("true", "false"):
+            raise ParseError("pet_friendly should be true or false.")
+        rooms = rooms.filter(pet_friendly=pet_friendly.lower() == "true")
+
+    amenities = params.get("amenities")
+    if amenities:
+        try:
+            amenity_pks = {int(pk) for pk in amenities.split(",") if pk}
+        except ValueError:
+            raise ParseError("amenities should be a list of ids.")
+        for amenity_pk in amenity_pks:
+            rooms = rooms.filter(
+                Exists(
+                    Room.amenities.through.objects.filter(
+                        room=OuterRef("pk"),
+                        amenity=amenity_pk,
+                    )
+                )
+            )
+
+    check_in = parse_date(params, "check_in")
+    check_out = parse_date(params, "check_out")
+    if check_in or check_out:
+        if not check_in or not check_out:
+            raise ParseError("check_in and check_out go together.")
+        if check_out <= check_in:
+            raise ParseError("Check in should be smaller than check out.")
+        rooms = rooms.filter(
+            ~Exists(
+                Booking.objects.filter(
+                    room=OuterRef("pk"),
+                    kind=Booking.BookingKindChoices.ROOM,
+                    check_in__lte=check_out,
+                    check_out__gte=check_in,
+                )
+            )
+        )
+    return rooms
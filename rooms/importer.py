@@ -0,0 +1,113 @@
+from django.db import transaction
+from categories.models import Category
+from search.backends import get_backend
+from .models import Amenity, Room
+from .serializers import RoomDetailSerializer
+
+MAX_ROWS = 10000
+
+BATCH_SIZE = 500
+
+
+def parse_pk(value):
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def parse_pks(value):
+    """Accept a list of pks, or a comma separated string from CSV."""
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        value = [pk for pk in value.split(",") if pk.strip()]
+    if not isinstance(value, list):
+        raise ValueError
+    return [int(pk) for pk in value]
+
+
+def validate_row(row, categories, amenities):
+    errors = {}
+    serializer = RoomDetailSerializer(data=row)
+    if not serializer.is_valid():
+        errors.update(serializer.errors)
+    category = categories.get(row["category"])
+    if row["category"] is None:
+        errors["category"] = ["Category is required."]
+    elif category is None:
+        errors["category"] = ["Category not found"]
+    elif category.kind == Category.CategoryKindChoices.EXPERIENCES:
+        errors["category"] = ["the category kind should be 'rooms'"]
+    missing = [pk for pk in row["amenities"] if pk not in amenities]
+    if missing:
+        errors["amenities"] = [f"Amenity {pk} not found" for pk in missing]
+    return serializer, category, errors
+
+
+def import_rooms(rows, owner):
+    """Create every valid row in bulk and return (rooms, errors)."""
+    errors = []
+    parsed = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            row = {
+                **row,
+                "category": parse_pk(row.get("category")),
+                "amenities": parse_pks(row.get("amenities")),
+            }
+        except (TypeError, ValueError):
+            errors.append(
+                {
+                    "row": number,
+                    "errors": {"non_field_errors": ["Invalid pk"]},
+                }
+            )
+            continue
+        parsed.append((number, row))
+
+    categories = Category.objects.in_bulk(
+        {row["category"] for number, row in parsed} - {None}
+    )
+    amenities = Amenity.objects.in_bulk(
+        {pk for number, row in parsed for pk in row["amenities"]}
+    )
+
+    rooms = []
+    room_amenities = []
+    for number, row in parsed:
+        serializer, category, row_errors = validate_row(
+            row,
+            categories,
+            amenities,
+        )
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+            continue
+        rooms.append(
+            Room(
+                **serializer.validated_data,
+                owner=owner,
+                category=category,
+            )
+        )
+        room_amenities.append(set(row["amenities"]))
+    errors.sort(key=lambda error: error["row"])
+
+    Through = Room.amenities.through
+    with transaction.atomic():
+        Room.objects.bulk_create(rooms, batch_size=BATCH_SIZE)
+        Through.objects.bulk_create(
+            [
+                Through(room_id=room.pk, amenity_id=amenity_pk)
+                for room, amenity_pks in zip(rooms, room_amenities)
+                for amenity_pk in amenity_pks
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    backend = get_backend()
+    for start in range(0, len(rooms), BATCH_SIZE):
+        backend.index(
+            Room,
+            [room.pk for room in rooms[start : start + BATCH_SIZE]],
+        )
+    return rooms, errors
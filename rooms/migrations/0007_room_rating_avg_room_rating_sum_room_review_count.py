@@ -0,0 +1,28 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0006_alter_room_amenities_alter_room_category_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="rating_avg",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0007_room_rating_avg_room_rating_sum_room_review_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(fields=["created_at", "id"], name="room_created_idx"),
+        ),
+    ]
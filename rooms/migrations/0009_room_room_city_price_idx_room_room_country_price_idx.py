@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0008_room_room_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(fields=["city", "price"], name="room_city_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["country", "price"], name="room_country_price_idx"
+            ),
+        ),
+    ]
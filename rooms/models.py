@@ -53,6 +53,34 @@ class Room(CommonModel):
         blank=True,
         on_delete=models.SET_NULL,
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_avg = models.FloatField(
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="room_created_idx",
+            ),
+            models.Index(
+                fields=["city", "price"],
+                name="room_city_price_idx",
+            ),
+            models.Index(
+                fields=["country", "price"],
+                name="room_country_price_idx",
+            ),
+        ]
 
     def __str__(room) -> str:
         return room.name
@@ -61,14 +89,7 @@ class Room(CommonModel):
         return room.amenities.count()
 
     def rating(room):
-        count = room.reviews.count()
-        if count == 0:
-            return 0
-        else:
-            total_rating = 0
-            for review in room.reviews.all().values("rating"):
-                total_rating += review["rating"]
-            return round(total_rating / count, 2)
+        return round(room.rating_avg, 2)
 
 
 class Amenity(CommonModel):
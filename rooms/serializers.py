@@ -3,7 +3,7 @@ from .models import Room, Amenity
 from users.serializers import TinyUserSerializer
 from categories.serializers import CategorySerializer
 from medias.serializers import PhotoSerializer
-from wishlists.models import Wishlist
+from wishlists.likes import liked_room_pks
 
 
 class AmenitySerializer(serializers.ModelSerializer):
@@ -47,21 +47,17 @@ class RoomDetailSerializer(serializers.ModelSerializer):
     def get_is_owner(self, room):
         request = self.context.get("request")
         if request:
-            return room.owner == request.user
+            return room.owner_id == request.user.pk
         return False
 
     def get_is_liked(self, room):
         request = self.context.get("request")
         if request:
-            if request.user.is_authenticated:
-                return Wishlist.objects.filter(
-                    user=request.user,
-                    rooms__pk=room.pk,
-                ).exists()
+            return room.pk in liked_room_pks(request)
         return False
 
     def get_reviews_count(self, room):
-        return room.reviews.count()
+        return room.review_count
 
 
 class RoomListSerializer(serializers.ModelSerializer):
@@ -82,10 +78,13 @@ class RoomListSerializer(serializers.ModelSerializer):
             "is_owner",
             "photos",
         )
+        row_values = ("rating_avg", "owner_id")
 
     def get_rating(self, room):
         return room.rating()
 
     def get_is_owner(self, room):
-        request = self.context["request"]
-        return room.owner == request.user
+        request = self.context.get("request")
+        if request:
+            return room.owner_id == request.user.pk
+        return False
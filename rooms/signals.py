@@ -0,0 +1,30 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from common.cache import invalidate, invalidate_namespace
+from .models import Amenity, Room
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room(sender, instance, **kwargs):
+    invalidate("rooms", instance.pk)
+
+
+@receiver(post_save, sender=Amenity)
+@receiver(post_delete, sender=Amenity)
+def invalidate_amenities(sender, instance, **kwargs):
+    invalidate_namespace("amenities")
+    invalidate_namespace("rooms")
+
+
+@receiver(m2m_changed, sender=Room.amenities.through)
+def invalidate_room_amenities(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate("rooms", instance.pk)
+    elif pk_set:
+        for pk in pk_set:
+            invalidate("rooms", pk)
+    else:
+        invalidate_namespace("rooms")
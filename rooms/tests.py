@@ -1,6 +1,18 @@
-from rest_framework.test import APITestCase
+import datetime
+import json
+from asgiref.testing import ApplicationCommunicator
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APITransactionTestCase
+from config.asgi import application
+from categories.models import Category
+from common.cache import make_key
 from . import models
 from users.models import User
+from medias.models import Photo
+from reviews.models import Review
+from bookings.models import Booking
 
 
 class TestAmenities(APITestCase):
@@ -44,6 +56,26 @@ class TestAmenities(APITestCase):
             self.DESC,
         )
 
+    def test_amenities_cache_is_invalidated(self):
+
+        self.assertEqual(len(self.client.get(self.URL).json()), 1)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.URL)
+
+        models.Amenity.objects.create(name="Another Amenity")
+
+        self.assertEqual(len(self.client.get(self.URL).json()), 2)
+
+    def test_stale_refill_is_dropped_on_commit(self):
+
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Amenity.objects.create(name="Another Amenity")
+            # What a reader that still sees the old rows would cache
+            cache.set(make_key("amenities"), [])
+
+        self.assertEqual(len(self.client.get(self.URL).json()), 2)
+
     def test_create_amenity(self):
 
         new_amenity_name = "New Amenity"
@@ -181,6 +213,287 @@ class TestAmenity(APITestCase):
         self.assertEqual(response.status_code, 204, "status code is not 204")
 
 
+class TestRoomList(APITestCase):
+
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+
+    def create_rooms(self, count):
+        for number in range(count):
+            room = models.Room.objects.create(
+                name=f"Room {number}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                address="Address",
+                kind=models.Room.RoomKindChocies.ENTIRE_PLACE,
+                owner=self.user,
+            )
+            Photo.objects.create(
+                file="https://example.com/photo.jpg",
+                description="Photo",
+                room=room,
+            )
+            Review.objects.create(
+                user=self.user,
+                room=room,
+                payload="Review",
+                rating=4,
+            )
+
+    def test_query_count_does_not_grow(self):
+
+        self.create_rooms(2)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+
+        self.create_rooms(3)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.URL)
+
+        data = response.json()
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[0]["rating"], 4)
+        self.assertFalse(data[0]["is_owner"])
+        self.assertEqual(len(data[0]["photos"]), 1)
+
+    def test_stream_all_rooms(self):
+
+        self.create_rooms(5)
+
+        with self.settings(STREAM_CHUNK_SIZE=2):
+            response = self.client.get(self.URL, {"stream": "true"})
+            with self.assertNumQueries(6):
+                parts = list(response.streaming_content)
+        content = b"".join(parts)
+        # The brackets and one piece per chunk
+        self.assertEqual(len(parts), 5)
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = json.loads(content)
+        self.assertEqual(
+            [room["name"] for room in data],
+            [f"Room {number}" for number in range(5)],
+        )
+        self.assertEqual(data[0]["rating"], 4)
+        self.assertEqual(len(data[0]["photos"]), 1)
+
+
+class TestRoomStreamOverASGI(APITransactionTestCase):
+
+    """Committed rows, the ASGI handler runs views in a thread of their own"""
+
+    def setUp(self):
+        user = User.objects.create(username="test")
+        for number in range(3):
+            models.Room.objects.create(
+                name=f"Room {number}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                address="Address",
+                kind=models.Room.RoomKindChocies.ENTIRE_PLACE,
+                owner=user,
+            )
+
+    async def test_stream_all_rooms(self):
+
+        communicator = ApplicationCommunicator(
+            application,
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/v1/rooms/",
+                "query_string": b"stream=true",
+                "headers": [(b"host", b"testserver")],
+            },
+        )
+        await communicator.send_input({"type": "http.request"})
+        start = await communicator.receive_output(timeout=5)
+        content = b""
+        more_body = True
+        while more_body:
+            body = await communicator.receive_output(timeout=5)
+            content += body.get("body", b"")
+            more_body = body.get("more_body", False)
+
+        self.assertEqual(start["status"], 200, "status code is not 200")
+        self.assertEqual(
+            [room["name"] for room in json.loads(content)],
+            [f"Room {number}" for number in range(3)],
+        )
+
+
+class TestRoomSearch(APITestCase):
+
+    URL = "/api/v1/rooms/search"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.amenity = models.Amenity.objects.create(name="Wifi")
+        self.busan = models.Room.objects.create(
+            name="Busan",
+            city="부산",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=models.Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.busan.amenities.add(self.amenity)
+        self.booked = models.Room.objects.create(
+            name="Booked",
+            city="부산",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=models.Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.booked.amenities.add(self.amenity)
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.booked,
+            check_in=datetime.date(2030, 1, 2),
+            check_out=datetime.date(2030, 1, 4),
+            guests=1,
+        )
+        models.Room.objects.create(
+            name="Seoul",
+            price=50,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=models.Room.RoomKindChocies.SHARED_ROOM,
+            owner=self.user,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.URL, data=params)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        return [room["name"] for room in response.json()]
+
+    def test_filters(self):
+
+        self.assertEqual(len(self.search()), 3)
+        self.assertEqual(self.search(city="부산"), ["Busan", "Booked"])
+        self.assertEqual(self.search(max_price=60), ["Seoul"])
+        self.assertEqual(self.search(kind="shared_room"), ["Seoul"])
+        self.assertEqual(
+            self.search(amenities=str(self.amenity.pk)),
+            ["Busan", "Booked"],
+        )
+
+    def test_available_dates(self):
+
+        self.assertEqual(
+            self.search(
+                city="부산",
+                check_in="2030-01-03",
+                check_out="2030-01-05",
+            ),
+            ["Busan"],
+        )
+        self.assertEqual(
+            len(self.search(check_in="2030-01-05", check_out="2030-01-06")),
+            3,
+        )
+
+    def test_invalid_params(self):
+
+        response = self.client.get(self.URL, data={"max_price": "cheap"})
+
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+
+class TestRoomImport(APITestCase):
+
+    URL = "/api/v1/rooms/import"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.client.force_login(self.user)
+        self.category = Category.objects.create(
+            name="Rooms",
+            kind=Category.CategoryKindChoices.ROOMS,
+        )
+        self.wifi = models.Amenity.objects.create(name="Wifi")
+        self.kitchen = models.Amenity.objects.create(name="Kitchen")
+
+    def make_row(self, number, **kwargs):
+        return {
+            "name": f"Room {number}",
+            "price": 100,
+            "rooms": 1,
+            "toilets": 1,
+            "address": "Address",
+            "kind": "entire_place",
+            "category": self.category.pk,
+            "amenities": [self.wifi.pk, self.kitchen.pk],
+            **kwargs,
+        }
+
+    def test_import_json_lines(self):
+
+        rows = [self.make_row(number) for number in range(20)]
+        rows.append(self.make_row(20, amenities=[999]))
+        rows.append(self.make_row(21, price="free"))
+
+        with self.assertNumQueries(10):
+            response = self.client.post(
+                self.URL,
+                data="\n".join(json.dumps(row) for row in rows),
+                content_type="application/x-ndjson",
+            )
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        data = response.json()
+        self.assertEqual(len(data["created"]), 20)
+        self.assertEqual(
+            [error["row"] for error in data["errors"]],
+            [21, 22],
+        )
+        self.assertIn("amenities", data["errors"][0]["errors"])
+        self.assertIn("price", data["errors"][1]["errors"])
+        room = models.Room.objects.get(pk=data["created"][0])
+        self.assertEqual(room.owner, self.user)
+        self.assertEqual(room.amenities.count(), 2)
+
+    def test_import_csv(self):
+
+        response = self.client.post(
+            self.URL,
+            data=(
+                "name,price,rooms,toilets,address,kind,category,amenities\n"
+                f"CSV Room,80,2,1,Address,private_room,{self.category.pk},"
+                f'"{self.wifi.pk},{self.kitchen.pk}"\n'
+                "No Category,80,2,1,Address,private_room,,\n"
+            ),
+            content_type="text/csv",
+        )
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        data = response.json()
+        self.assertEqual(len(data["created"]), 1)
+        self.assertEqual(data["errors"][0]["row"], 2)
+        room = models.Room.objects.get(pk=data["created"][0])
+        self.assertEqual(room.name, "CSV Room")
+        self.assertEqual(room.amenities.count(), 2)
+
+
 class TestRooms(APITestCase):
     def setUp(self):
         user = User.objects.create(
@@ -202,3 +515,131 @@ class TestRooms(APITestCase):
 
         response = self.client.post("/api/v1/rooms/")
         print(response.json())
+
+
+class TestRoomAmenities(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.client.force_login(self.user)
+        self.amenities = [
+            models.Amenity.objects.create(name=f"Amenity {number}")
+            for number in range(40)
+        ]
+        self.room = models.Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=models.Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.room.amenities.set(self.amenities[:20])
+        self.URL = f"/api/v1/rooms/{self.room.pk}"
+
+    def put_amenities(self, pks):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(
+                self.URL,
+                data={"amenities": pks},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertEqual(
+            set(self.room.amenities.values_list("pk", flat=True)),
+            set(pks),
+        )
+        return len(queries)
+
+    def test_queries_do_not_grow_with_the_amenities(self):
+
+        one_change = self.put_amenities(
+            [amenity.pk for amenity in self.amenities[1:21]]
+        )
+        many_changes = self.put_amenities(
+            [amenity.pk for amenity in self.amenities[11:40]]
+        )
+
+        self.assertEqual(one_change, many_changes)
+
+    def test_unknown_amenity_changes_nothing(self):
+
+        response = self.client.put(
+            self.URL,
+            data={
+                "name": "Renamed",
+                "amenities": [self.amenities[0].pk, 999],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 404, "status code is not 404")
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.name, "Room")
+        self.assertEqual(self.room.amenities.count(), 20)
+
+
+class TestRoomConditionalGet(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.room = models.Room.objects.create(
+            name="Room",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=models.Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.URL = f"/api/v1/rooms/{self.room.pk}"
+
+    def test_not_modified(self):
+
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304, "status code is not 304")
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_nested_changes_update_the_etag(self):
+
+        etag = self.client.get(self.URL)["ETag"]
+
+        Photo.objects.create(
+            file="https://example.com/photo.jpg",
+            description="Photo",
+            room=self.room,
+        )
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertEqual(len(response.json()["photos"]), 1)
+        etag = response["ETag"]
+
+        Review.objects.create(
+            user=self.user,
+            room=self.room,
+            payload="Review",
+            rating=5,
+        )
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertEqual(response.json()["rating"], 5)
+
+    def test_etag_depends_on_the_viewer(self):
+
+        etag = self.client.get(self.URL)["ETag"]
+
+        self.client.force_login(self.user)
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertTrue(response.json()["is_owner"])
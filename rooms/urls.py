@@ -3,12 +3,17 @@ from . import views
 
 urlpatterns = [
     path("", views.Rooms.as_view()),
+    path("search", views.RoomSearch.as_view()),
+    path("import", views.RoomImport.as_view()),
     path("<int:pk>", views.RoomDetail.as_view()),
     path("<int:pk>/reviews", views.RoomReviews.as_view()),
     path("<int:pk>/amenities", views.RoomAmenities.as_view()),
     path("<int:pk>/photos", views.RoomPhotos.as_view()),
     path("<int:pk>/bookings", views.RoomBookings.as_view()),
     path("<int:pk>/bookings/check", views.RoomBookingCheck.as_view()),
+    path("<int:pk>/calendar", views.RoomCalendar.as_view()),
+    path("<int:pk>/availability", views.RoomAvailability.as_view()),
+    path("availability", views.RoomsAvailability.as_view()),
     path("amenities/", views.Amenities.as_view()),
     path("amenities/<int:pk>", views.AmenityDetail.as_view()),
     path("make-error", views.make_error),
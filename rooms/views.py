@@ -1,18 +1,25 @@
 import time
 import datetime
-import pytz
 from django.conf import settings
 from django.db import transaction
-from django.utils import timezone
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.status import HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST
+from rest_framework.permissions import (
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
+)
 from rest_framework.response import Response
 from rest_framework.exceptions import (
     NotFound,
     ParseError,
     PermissionDenied,
 )
+from .filters import filter_rooms
+from .importer import MAX_ROWS, import_rooms
 from .models import Amenity, Room
 from .serializers import (
     AmenitySerializer,
@@ -20,9 +27,25 @@ from .serializers import (
     RoomDetailSerializer,
 )
 from categories.models import Category
+from common.cache import cached
+from common.conditional import get_list_stamp, get_stamp
+from common.fast_serializers import compiled, fast_data
+from common.m2m import sync_m2m
+from common.parsers import CSVParser, JSONLinesParser, ORJSONParser
+from common.pagination import KeysetPagination
+from common.streaming import StreamingJSONResponse, wants_stream
 from reviews.serializers import ReviewSerializer
+from medias.models import Photo
 from medias.serializers import PhotoSerializer
 from bookings.models import Booking
+from wishlists.likes import liked_room_pks
+from bookings.availability import MAX_ROOMS, get_availability, parse_window
+from bookings.calendar import (
+    get_booking_pks,
+    get_calendar,
+    is_booked,
+    parse_months,
+)
 from bookings.serializers import (
     PublicBookingSerializer,
     CreateRoomBookingSerializer,
@@ -31,9 +54,19 @@ from bookings.serializers import (
 
 class Amenities(APIView):
     def get(self, request):
-        all_amenities = Amenity.objects.all()
-        serializer = AmenitySerializer(all_amenities, many=True)
-        return Response(serializer.data)
+        stamp = cached(
+            lambda: get_list_stamp(Amenity.objects.all()),
+            "amenities",
+            "stamp",
+        )
+        response = stamp.not_modified(request)
+        if response is not None:
+            return response
+        data = cached(
+            lambda: AmenitySerializer(Amenity.objects.all(), many=True).data,
+            "amenities",
+        )
+        return stamp.apply(Response(data))
 
     def post(self, request):
         serializer = AmenitySerializer(data=request.data)
@@ -90,13 +123,21 @@ class Rooms(APIView):
 
     def get(self, request):
 
-        all_rooms = Room.objects.all()
-        serializer = RoomListSerializer(
-            all_rooms,
-            many=True,
-            context={"request": request},
+        serializer = compiled(RoomListSerializer)
+        if wants_stream(request):
+            return StreamingJSONResponse(
+                Room.objects.all(),
+                serializer,
+                context={"request": request},
+            )
+        paginator = KeysetPagination(page_size=settings.LIST_PAGE_SIZE)
+        rooms = paginator.paginate_queryset(
+            serializer.values(Room.objects.all(), "created_at"),
+            request,
+        )
+        return paginator.get_paginated_response(
+            serializer.serialize(rooms, {"request": request})
         )
-        return Response(serializer.data)
 
     def post(self, request):
         serializer = RoomDetailSerializer(data=request.data)
@@ -110,23 +151,21 @@ class Rooms(APIView):
                     raise ParseError("the category kind should be 'rooms'")
             except Category.DoesNotExist:
                 raise ParseError("Category not found")
-            try:
-                with transaction.atomic():
-                    room = serializer.save(
-                        owner=request.user,
-                        category=category,
-                    )
-                    amenities = request.data.get("amenities")
-                    for amenity_pk in amenities:
-                        amenity = Amenity.objects.get(pk=amenity_pk)
-                        room.amenities.add(amenity)
-                    serializer = RoomDetailSerializer(
-                        room,
-                        context={"request": request},
-                    )
-                    return Response(serializer.data)
-            except Exception:
-                raise ParseError("Amenity not found")
+            with transaction.atomic():
+                room = serializer.save(
+                    owner=request.user,
+                    category=category,
+                )
+                sync_m2m(
+                    room.amenities,
+                    request.data.get("amenities", []),
+                    ParseError("Amenity not found"),
+                )
+            serializer = RoomDetailSerializer(
+                room,
+                context={"request": request},
+            )
+            return Response(serializer.data)
         else:
             return Response(
                 serializer.errors,
@@ -134,6 +173,47 @@ class Rooms(APIView):
             )
 
 
+class RoomImport(APIView):
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONLinesParser, CSVParser, ORJSONParser]
+
+    def post(self, request):
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ParseError("Send a list of rooms.")
+        if len(rows) > MAX_ROWS:
+            raise ParseError(f"Import at most {MAX_ROWS} rooms at a time.")
+        if not all(isinstance(row, dict) for row in rows):
+            raise ParseError("Every room should be an object.")
+        rooms, errors = import_rooms(rows, request.user)
+        return Response(
+            {
+                "created": [room.pk for room in rooms],
+                "errors": errors,
+            },
+            status=HTTP_400_BAD_REQUEST if errors and not rooms else HTTP_200_OK,
+        )
+
+
+class RoomSearch(APIView):
+    def get(self, request):
+        paginator = KeysetPagination(page_size=settings.LIST_PAGE_SIZE)
+        rooms = paginator.paginate_queryset(
+            filter_rooms(
+                Room.objects.prefetch_related("photos"),
+                request.query_params,
+            ),
+            request,
+        )
+        serializer = RoomListSerializer(
+            rooms,
+            many=True,
+            context={"request": request},
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
 class RoomDetail(APIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -144,13 +224,59 @@ class RoomDetail(APIView):
         except Room.DoesNotExist:
             raise NotFound
 
-    def get(self, request, pk):
+    def serialize(self, request, pk):
         room = self.get_object(pk)
         serializer = RoomDetailSerializer(
             room,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return serializer.data
+
+    def get_stamp(self, request, pk):
+        extra = ()
+        if request.user.is_authenticated:
+            extra = (request.user.pk, pk in liked_room_pks(request))
+        stamp = get_stamp(
+            Room.objects.filter(pk=pk),
+            (
+                "updated_at",
+                "rating_sum",
+                "review_count",
+                "category__updated_at",
+                "owner__name",
+                "owner__avatar",
+                "owner__username",
+            ),
+            {
+                "photos": (Photo.objects.all(), "room"),
+                "amenities": (Amenity.objects.all(), "rooms"),
+            },
+            extra,
+        )
+        if stamp is None:
+            raise NotFound
+        return stamp
+
+    def get(self, request, pk):
+        if request.user.is_authenticated:
+            stamp = self.get_stamp(request, pk)
+            data = None
+        else:
+            # Cached together, so a hit answers without a query
+            stamp, data = cached(
+                lambda: (
+                    self.get_stamp(request, pk),
+                    self.serialize(request, pk),
+                ),
+                "rooms",
+                pk,
+            )
+        response = stamp.not_modified(request)
+        if response is not None:
+            return response
+        if data is None:
+            data = self.serialize(request, pk)
+        return stamp.apply(Response(data))
 
     def put(self, request, pk):
         room = self.get_object(pk)
@@ -163,33 +289,25 @@ class RoomDetail(APIView):
         )
         if serializer.is_valid():
             category_pk = request.data.get("category")
-            if category_pk:  # if the category is updated
-                try:
-                    category = Category.objects.get(pk=category_pk)
-                    if (
-                        category.kind
-                        == category.CategoryKindChoices.EXPERIENCES
-                    ):
-                        raise ParseError("the category kind should be 'rooms'")
-                except Category.DoesNotExist:
-                    raise NotFound
-                room = serializer.save(category=category)
-            else:  # if the category is not updated
-                room = serializer.save()
-
-            amenities = request.data.get("amenities")
-            if amenities:  # if the amenities are updated
-                room.amenities.clear()
-                for amenity_pk in amenities:
+            with transaction.atomic():
+                if category_pk:  # if the category is updated
                     try:
-                        amenity = Amenity.objects.get(pk=amenity_pk)
-                        room.amenities.add(amenity)
-                    except Amenity.DoesNotExist:
-                        raise NotFound(
-                            "The amenities are not updated correctly"
-                        )
-            else:  # if the amenities are not updated
-                pass
+                        category = Category.objects.get(pk=category_pk)
+                        if category.kind == category.CategoryKindChoices.EXPERIENCES:
+                            raise ParseError("the category kind should be 'rooms'")
+                    except Category.DoesNotExist:
+                        raise NotFound
+                    room = serializer.save(category=category)
+                else:  # if the category is not updated
+                    room = serializer.save()
+
+                amenities = request.data.get("amenities")
+                if amenities is not None:  # if the amenities are updated
+                    sync_m2m(
+                        room.amenities,
+                        amenities,
+                        NotFound("The amenities are not updated correctly"),
+                    )
 
             return Response(RoomDetailSerializer(room).data)
         else:
@@ -214,20 +332,14 @@ class RoomReviews(APIView):
             raise NotFound
 
     def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
         room = self.get_object(pk)
-        serializer = ReviewSerializer(
-            room.reviews.all()[start:end],
-            many=True,
+        serializer = compiled(ReviewSerializer)
+        paginator = KeysetPagination()
+        reviews = paginator.paginate_queryset(
+            serializer.values(room.reviews.all(), "created_at"),
+            request,
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.serialize(reviews))
 
     def post(self, request, pk):
         serializer = ReviewSerializer(data=request.data)
@@ -250,21 +362,14 @@ class RoomAmenities(APIView):
             raise NotFound
 
     def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
         room = self.get_object(pk)
-        amenities = room.amenities.all()[start:end]
+        paginator = KeysetPagination()
+        amenities = paginator.paginate_queryset(room.amenities.all(), request)
         serializer = AmenitySerializer(
             amenities,
             many=True,
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class RoomPhotos(APIView):
@@ -301,45 +406,12 @@ class RoomBookings(APIView):
             raise NotFound
 
     def get(self, request, pk):
-        now = timezone.localtime(timezone.now()).date()
-        try:
-            month = int(request.query_params.get("month", now.month))
-            year = int(request.query_params.get("year", now.year))
-            if year < now.year:
-                year = now.year
-                month = now.month
-            elif (year == now.year) and (month < now.month):
-                month = now.month
-        except ValueError:
-            month = now.month
-            year = now.year
-
-        date_range_start = datetime.date(year, month, 1)
-        if month == 12:
-            date_range_end = datetime.datetime(year + 1, 1, 1, tzinfo=pytz.UTC)
-        else:
-            date_range_end = datetime.datetime(
-                year, month + 1, 1, tzinfo=pytz.UTC
-            )
-
+        start, end = parse_months(request)
         room = self.get_object(pk)
-        if room.owner == request.user:
-            bookings = Booking.objects.filter(
-                room=room,
-                kind=Booking.BookingKindChoices.ROOM,
-                check_in__gte=date_range_start,
-                check_in__lt=date_range_end,
-            )
-        else:
-            bookings = Booking.objects.filter(
-                room=room,
-                kind=Booking.BookingKindChoices.ROOM,
-                check_in__gte=date_range_start,
-                check_in__lt=date_range_end,
-                user=request.user,
-            )
-        serializer = PublicBookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+        bookings = Booking.objects.filter(pk__in=get_booking_pks(start, end, room=room))
+        if room.owner != request.user:
+            bookings = bookings.filter(user=request.user)
+        return Response(fast_data(PublicBookingSerializer, bookings))
 
     def post(self, request, pk):
         room = self.get_object(pk)
@@ -370,16 +442,81 @@ class RoomBookingCheck(APIView):
         room = self.get_object(pk)
         check_out = request.query_params.get("check_out")
         check_in = request.query_params.get("check_in")
-        exists = Booking.objects.filter(
-            room=room,
-            check_in__lte=check_out,
-            check_out__gte=check_in,
-        ).exists()
-        if exists:
+        if not check_in or not check_out:
+            raise ParseError("check_in and check_out are required.")
+        if is_booked(room, check_in, check_out):
             return Response({"ok": False})
         else:
             return Response({"ok": True})
 
 
+class RoomCalendar(APIView):
+    def get_object(self, pk):
+        try:
+            return Room.objects.get(pk=pk)
+        except Room.DoesNotExist:
+            raise NotFound
+
+    def get(self, request, pk):
+        start, end = parse_months(request)
+        room = self.get_object(pk)
+        days = get_calendar(start, end, room=room)
+        if room.owner_id != request.user.pk:
+            for day in days:
+                del day["guests"]
+        return Response(
+            {
+                "start": start,
+                "end": end - datetime.timedelta(days=1),
+                "days": days,
+            }
+        )
+
+
+class RoomAvailability(APIView):
+    def get_object(self, pk):
+        try:
+            return Room.objects.get(pk=pk)
+        except Room.DoesNotExist:
+            raise NotFound
+
+    def get(self, request, pk):
+        start, end = parse_window(request)
+        room = self.get_object(pk)
+        availability = get_availability([room.pk], start, end)
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                **availability[room.pk],
+            }
+        )
+
+
+class RoomsAvailability(APIView):
+    def get(self, request):
+        start, end = parse_window(request)
+        try:
+            room_pks = [
+                int(pk) for pk in request.query_params.get("rooms", "").split(",") if pk
+            ]
+        except ValueError:
+            raise ParseError("rooms should be a comma separated list of ids.")
+        if not room_pks:
+            raise ParseError("rooms is required.")
+        if len(room_pks) > MAX_ROOMS:
+            raise ParseError(f"You can't ask for more than {MAX_ROOMS} rooms.")
+        room_pks = list(
+            Room.objects.filter(pk__in=room_pks).values_list("pk", flat=True)
+        )
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "rooms": get_availability(room_pks, start, end),
+            }
+        )
+
+
 def make_error(request):
     division_by_zero = 1 / 0
@@ -0,0 +1,141 @@
+from django.apps import apps
+from django.db import connection as default_connection
+from django.db.models import Q
+
+SEARCH_FIELDS = {
+    "rooms.Room": ("name", "description", "city", "address"),
+    "experiences.Experience": ("name", "description"),
+}
+
+
+def get_search_models():
+    for label, fields in SEARCH_FIELDS.items():
+        yield apps.get_model(label), fields
+
+
+def get_fields(model):
+    return SEARCH_FIELDS[model._meta.label]
+
+
+class SearchBackend:
+
+    """Fallback that scans the columns with icontains"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index(self, model, pks):
+        pass
+
+    def remove(self, model, pks):
+        pass
+
+    def search(self, model, query, limit):
+        condition = Q()
+        for term in query.split():
+            term_condition = Q()
+            for field in get_fields(model):
+                term_condition |= Q(**{f"{field}__icontains": term})
+            condition &= term_condition
+        return list(
+            model.objects.filter(condition).values_list("pk", flat=True)[:limit]
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+
+    """Stored tsvector column with a GIN index and trigram name matching"""
+
+    WEIGHTS = "ABCD"
+
+    def get_vector(self, fields):
+        return " || ".join(
+            "setweight(to_tsvector('simple', coalesce({}, '')), '{}')".format(
+                field,
+                self.WEIGHTS[min(position, len(self.WEIGHTS) - 1)],
+            )
+            for position, field in enumerate(fields)
+        )
+
+    def index(self, model, pks):
+        table = model._meta.db_table
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} "
+                f"SET search_vector = {self.get_vector(get_fields(model))} "
+                "WHERE id = ANY(%s)",
+                [list(pks)],
+            )
+
+    def search(self, model, query, limit):
+        table = model._meta.db_table
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {table}, plainto_tsquery('simple', %s) query "
+                "WHERE search_vector @@ query OR name %% %s OR name ILIKE %s "
+                "ORDER BY coalesce(ts_rank(search_vector, query), 0) "
+                "+ similarity(name, %s) DESC "
+                "LIMIT %s",
+                [query, query, f"%{query}%", query, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class SQLiteSearchBackend(SearchBackend):
+
+    """FTS5 shadow tables keyed by the row id, for local development"""
+
+    def get_table(self, table):
+        return f"{table}_search"
+
+    def index(self, model, pks):
+        table = model._meta.db_table
+        columns = ", ".join(get_fields(model))
+        placeholders = ", ".join(["%s"] * len(pks))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.get_table(table)} "
+                f"WHERE rowid IN ({placeholders})",
+                list(pks),
+            )
+            cursor.execute(
+                f"INSERT INTO {self.get_table(table)} (rowid, {columns}) "
+                f"SELECT id, {columns} FROM {table} "
+                f"WHERE id IN ({placeholders})",
+                list(pks),
+            )
+
+    def remove(self, model, pks):
+        placeholders = ", ".join(["%s"] * len(pks))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.get_table(model._meta.db_table)} "
+                f"WHERE rowid IN ({placeholders})",
+                list(pks),
+            )
+
+    def search(self, model, query, limit):
+        terms = query.split()
+        if any(len(term) < 3 for term in terms):
+            # The trigram tokenizer can't match terms shorter than 3 chars
+            return super().search(model, query, limit)
+        match = " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        table = self.get_table(model._meta.db_table)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {table} WHERE {table} MATCH %s "
+                "ORDER BY rank LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_backend(connection=None):
+    connection = connection or default_connection
+    return BACKENDS.get(connection.vendor, SearchBackend)(connection)
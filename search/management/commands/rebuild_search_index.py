@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from search.backends import get_backend, get_search_models
+
+
+class Command(BaseCommand):
+
+    help = "Reindex every room and experience for full text search"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        for model, fields in get_search_models():
+            pks = list(model.objects.values_list("pk", flat=True))
+            for start in range(0, len(pks), options["batch_size"]):
+                backend.index(model, pks[start : start + options["batch_size"]])
+            self.stdout.write(f"Indexed {len(pks)} {model._meta.verbose_name_plural}.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,87 @@
+from django.db import OperationalError, migrations
+
+# Frozen copies of what search.backends expects, so later changes to the
+# backends can't change what this migration does.
+TABLES = {
+    "rooms_room": ("name", "description", "city", "address"),
+    "experiences_experience": ("name", "description"),
+}
+
+WEIGHTS = "ABCD"
+
+
+def get_vector(fields):
+    return " || ".join(
+        "setweight(to_tsvector('simple', coalesce({}, '')), '{}')".format(
+            field,
+            WEIGHTS[min(position, len(WEIGHTS) - 1)],
+        )
+        for position, field in enumerate(fields)
+    )
+
+
+def install_postgresql(schema_editor):
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, fields in TABLES.items():
+        schema_editor.execute(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector")
+        schema_editor.execute(
+            f"CREATE INDEX {table}_search_idx ON {table} USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {table}_name_trgm_idx "
+            f"ON {table} USING gin (name gin_trgm_ops)"
+        )
+        schema_editor.execute(
+            f"UPDATE {table} SET search_vector = {get_vector(fields)}"
+        )
+
+
+def install_sqlite(schema_editor):
+    for table, fields in TABLES.items():
+        columns = ", ".join(fields)
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table}_search "
+                f"USING fts5({columns}, tokenize='trigram')"
+            )
+        except OperationalError:
+            # SQLite before 3.34 has no trigram tokenizer
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table}_search USING fts5({columns})"
+            )
+        schema_editor.execute(
+            f"INSERT INTO {table}_search (rowid, {columns}) "
+            f"SELECT id, {columns} FROM {table}"
+        )
+
+
+def install(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        install_postgresql(schema_editor)
+    elif vendor == "sqlite":
+        install_sqlite(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in TABLES:
+        if vendor == "postgresql":
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_name_trgm_idx")
+            schema_editor.execute(
+                f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector"
+            )
+        elif vendor == "sqlite":
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0005_experience_experience_created_idx"),
+        ("rooms", "0009_room_room_city_price_idx_room_room_country_price_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
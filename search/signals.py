@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from experiences.models import Experience
+from rooms.models import Room
+from .backends import get_backend
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_save, sender=Experience)
+def index_listing(sender, instance, **kwargs):
+    get_backend().index(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=Experience)
+def remove_listing(sender, instance, **kwargs):
+    get_backend().remove(sender, [instance.pk])
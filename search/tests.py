@@ -0,0 +1,120 @@
+import datetime
+import importlib
+from unittest import mock
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from experiences.models import Experience
+from rooms.models import Room
+from .backends import PostgresSearchBackend, get_search_models
+from users.models import User
+
+
+class TestSearch(APITestCase):
+
+    URL = "/api/v1/search/"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.room = Room.objects.create(
+            name="해운대 오션뷰 아파트",
+            city="부산",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            description="Sea view apartment",
+            kind=Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        Room.objects.create(
+            name="Hanok stay",
+            price=100,
+            rooms=1,
+            toilets=1,
+            address="Address",
+            kind=Room.RoomKindChocies.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        Experience.objects.create(
+            name="Surfing lesson",
+            host=self.user,
+            price=100,
+            address="Address",
+            start=datetime.time(10),
+            end=datetime.time(12),
+            description="Learn to surf at Haeundae",
+        )
+
+    def search(self, query):
+        response = self.client.get(self.URL, data={"q": query})
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        data = response.json()
+        return (
+            [room["name"] for room in data["rooms"]],
+            [experience["name"] for experience in data["experiences"]],
+        )
+
+    def test_search(self):
+
+        self.assertEqual(self.search("오션뷰"), (["해운대 오션뷰 아파트"], []))
+        self.assertEqual(self.search("apartment"), (["해운대 오션뷰 아파트"], []))
+        self.assertEqual(self.search("Haeundae"), ([], ["Surfing lesson"]))
+
+    def test_index_follows_changes(self):
+
+        self.room.name = "Gwangalli loft"
+        self.room.save()
+        self.assertEqual(self.search("오션뷰"), ([], []))
+        self.assertEqual(self.search("Gwangalli"), (["Gwangalli loft"], []))
+
+        self.room.delete()
+        self.assertEqual(self.search("Gwangalli"), ([], []))
+
+    def test_query_is_required(self):
+
+        response = self.client.get(self.URL)
+
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+
+class TestPostgresSearchBackend(SimpleTestCase):
+    def setUp(self):
+        self.connection = mock.MagicMock()
+        self.cursor = self.connection.cursor.return_value.__enter__()
+        self.backend = PostgresSearchBackend(self.connection)
+
+    def test_migration_builds_the_same_vector(self):
+
+        migration = importlib.import_module("search.migrations.0001_initial")
+        for model, fields in get_search_models():
+            self.assertEqual(
+                migration.TABLES[model._meta.db_table],
+                fields,
+            )
+            self.assertEqual(
+                migration.get_vector(fields),
+                self.backend.get_vector(fields),
+            )
+
+    def test_index(self):
+
+        self.backend.index(Room, [1, 2])
+
+        sql, params = self.cursor.execute.call_args.args
+        self.assertIn("UPDATE rooms_room SET search_vector = ", sql)
+        self.assertIn("to_tsvector('simple', coalesce(name, '')), 'A'", sql)
+        self.assertIn("coalesce(address, '')), 'D'", sql)
+        self.assertEqual(params, [[1, 2]])
+
+    def test_search(self):
+
+        self.cursor.fetchall.return_value = [(3,), (1,)]
+
+        pks = self.backend.search(Room, "오션뷰", 10)
+
+        sql, params = self.cursor.execute.call_args.args
+        self.assertIn("search_vector @@ query", sql)
+        self.assertEqual(params, ["오션뷰", "오션뷰", "%오션뷰%", "오션뷰", 10])
+        self.assertEqual(pks, [3, 1])
@@ -0,0 +1,51 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from experiences.models import Experience
+from experiences.serializers import ExperienceListSerializer
+from rooms.models import Room
+from rooms.serializers import RoomListSerializer
+from .backends import get_backend
+
+MAX_LIMIT = 50
+
+
+class Search(APIView):
+    def get_ranked(self, queryset, pks):
+        objects = queryset.in_bulk(pks)
+        return [objects[pk] for pk in pks if pk in objects]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ParseError("q is required.")
+        try:
+            limit = int(request.query_params.get("limit", settings.LIST_PAGE_SIZE))
+        except ValueError:
+            raise ParseError("limit should be a number.")
+        limit = max(1, min(limit, MAX_LIMIT))
+        backend = get_backend()
+        rooms = self.get_ranked(
+            Room.objects.prefetch_related("photos"),
+            backend.search(Room, query, limit),
+        )
+        experiences = self.get_ranked(
+            Experience.objects.select_related("video").prefetch_related("photos"),
+            backend.search(Experience, query, limit),
+        )
+        context = {"request": request}
+        return Response(
+            {
+                "rooms": RoomListSerializer(
+                    rooms,
+                    many=True,
+                    context=context,
+                ).data,
+                "experiences": ExperienceListSerializer(
+                    experiences,
+                    many=True,
+                    context=context,
+                ).data,
+            }
+        )
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+from . import passwords
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    """PBKDF2 on the bounded password pool, with the work factor taken from
+    PASSWORD_HASH_ITERATIONS
+
+    Every hash goes through users.passwords, whether it comes from
+    authenticate(), check_password() or set_password(), so the pool bounds
+    them all. Stored hashes keep the pbkdf2_sha256 prefix, so existing
+    passwords still verify and get rehashed on the next log in once the
+    setting changes.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        return passwords.run(super().encode, password, salt, iterations)
@@ -1,10 +1,8 @@
-class MyMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
+from django.utils.deprecation import MiddlewareMixin
 
-    def __call__(self, request):
 
-        response = self.get_response(request)
+class MyMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
 
         response["response"] = "true"
 
@@ -0,0 +1,72 @@
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+from common import metrics
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="passwords",
+)
+
+slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE
+)
+
+lock = threading.Lock()
+
+in_flight = 0
+
+rejecting = ContextVar("rejecting", default=False)
+
+
+def track(change):
+    global in_flight
+    with lock:
+        in_flight += change
+        queued = max(in_flight - settings.PASSWORD_HASH_WORKERS, 0)
+    metrics.gauge("passwords.in_flight", in_flight)
+    metrics.gauge("passwords.queued", queued)
+
+
+def timed(function, *args):
+    with metrics.timer("passwords.hash"):
+        return function(*args)
+
+
+def reject_when_full(method):
+    """Let the hashing calls of a DRF view method answer 429 when the pool
+    is full, everywhere else they wait for a slot."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = rejecting.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            rejecting.reset(token)
+
+    return wrapper
+
+
+def run(function, *args):
+    """Run a hashing call on the pool, or refuse it when the pool is full.
+
+    Only calls under reject_when_full are refused, Throttled is a 500 to
+    the admin and anything else that isn't a DRF view.
+    """
+    if rejecting.get():
+        if not slots.acquire(blocking=False):
+            metrics.increment("passwords.rejected")
+            raise Throttled(wait=settings.PASSWORD_HASH_RETRY_AFTER)
+    else:
+        slots.acquire()
+    track(1)
+    try:
+        with metrics.timer("passwords.wait"):
+            return executor.submit(timed, function, *args).result()
+    finally:
+        track(-1)
+        slots.release()
@@ -1,3 +1,266 @@
-from django.test import TestCase
+import threading
+from unittest import mock
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from common import metrics
+from config.authentication import create_token, verified_tokens
+from .models import User
 
-# Create your tests here.
+
+class TestJWTAuthentication(APITestCase):
+
+    PASSWORD = "123"
+
+    def setUp(self):
+        verified_tokens.clear()
+        user = User.objects.create(
+            username="test",
+        )
+        user.set_password(self.PASSWORD)
+        user.save()
+        self.user = user
+        response = self.client.post(
+            "/api/v1/users/jwt-login",
+            data={
+                "username": "test",
+                "password": self.PASSWORD,
+            },
+        )
+        self.token = response.json()["token"]
+        self.client.cookies.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=self.token)
+
+    def test_verified_token_is_cached(self):
+
+        response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.json()["username"], "test")
+
+    def test_saved_user_is_not_served_from_the_cache(self):
+
+        self.client.get("/api/v1/users/me")
+        response = self.client.put("/api/v1/users/me", data={"name": "New"})
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+
+        response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.json()["name"], "New")
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.status_code, 401, "status code is not 401")
+
+    def test_other_workers_drop_their_cached_tokens(self):
+
+        self.client.get("/api/v1/users/me")
+        # What another worker's Me.put leaves behind, this cache untouched
+        User.objects.filter(pk=self.user.pk).update(name="New")
+        cache.set(f"jwt:user:{self.user.pk}", 1)
+        response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.json()["name"], "New")
+
+        # And its log out
+        claims = response.wsgi_request.auth
+        cache.set(f"jwt:revoked:{claims['jti']}", True)
+        response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.status_code, 401, "status code is not 401")
+
+    def test_invalid_token(self):
+
+        self.client.credentials(HTTP_AUTHORIZATION="not-a-token")
+
+        response = self.client.get("/api/v1/users/me")
+
+        self.assertEqual(response.status_code, 401, "status code is not 401")
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+
+    def test_password_change_invalidates_token(self):
+
+        response = self.client.put(
+            "/api/v1/users/change-password",
+            data={
+                "old_password": self.PASSWORD,
+                "new_password": "456",
+            },
+        )
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+
+        response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.status_code, 401, "status code is not 401")
+
+    def test_log_out_revokes_token(self):
+
+        response = self.client.post("/api/v1/users/log-out")
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+
+        response = self.client.get("/api/v1/users/me")
+        self.assertEqual(response.status_code, 401, "status code is not 401")
+
+
+class TestAuthenticationDispatch(APITestCase):
+    def setUp(self):
+        verified_tokens.clear()
+        metrics.reset()
+        self.user = User.objects.create(
+            username="test",
+        )
+
+    def test_jwt_skips_the_session(self):
+
+        self.client.force_login(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=create_token(self.user))
+
+        response = self.client.get("/api/v1/users/me")
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        timers = metrics.snapshot()["timers"]
+        self.assertEqual(timers["auth.jwt"]["count"], 1)
+        self.assertNotIn("auth.session", timers)
+
+    def test_metrics_are_for_admins(self):
+
+        self.client.force_login(self.user)
+        response = self.client.get("/api/v1/metrics/")
+        self.assertEqual(response.status_code, 403, "status code is not 403")
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get("/api/v1/metrics/")
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertEqual(
+            response.json()["timers"]["auth.session"]["count"],
+            2,
+        )
+
+
+class TestGithubLogIn(APITestCase):
+    def fake_request(self, method, url, **kwargs):
+        payloads = {
+            "https://github.com/login/oauth/access_token": {
+                "access_token": "gho_test",
+            },
+            "https://api.github.com/user": {
+                "login": "octocat",
+                "name": "Octocat",
+                "avatar_url": "https://example.com/octocat.png",
+            },
+            "https://api.github.com/user/emails": [
+                {"email": "octocat@example.com"},
+            ],
+        }
+        response = mock.Mock()
+        response.json.return_value = payloads[url]
+        return response
+
+    def test_log_in_creates_user(self):
+
+        with mock.patch(
+            "users.oauth.session.request",
+            side_effect=self.fake_request,
+        ):
+            response = self.client.post(
+                "/api/v1/users/github",
+                data={"code": "code"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.assertIn("token", response.json())
+        user = User.objects.get(email="octocat@example.com")
+        self.assertEqual(user.username, "octocat")
+        self.assertFalse(user.has_usable_password())
+
+    def test_provider_error(self):
+
+        with mock.patch(
+            "users.oauth.session.request",
+            side_effect=ConnectionError,
+        ):
+            response = self.client.post(
+                "/api/v1/users/github",
+                data={"code": "code"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+
+class TestPasswords(APITestCase):
+
+    PASSWORD = "123"
+
+    def setUp(self):
+        metrics.reset()
+        user = User.objects.create(
+            username="test",
+        )
+        user.set_password(self.PASSWORD)
+        user.save()
+        self.user = user
+
+    def log_in(self):
+        return self.client.post(
+            "/api/v1/users/log-in",
+            data={
+                "username": "test",
+                "password": self.PASSWORD,
+            },
+        )
+
+    def test_log_in_rehashes_outdated_password(self):
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            response = self.log_in()
+
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+    def test_wrong_password(self):
+
+        response = self.client.post(
+            "/api/v1/users/log-in",
+            data={
+                "username": "test",
+                "password": "wrong",
+            },
+        )
+
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+    def test_inactive_user_can_not_log_in(self):
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.log_in()
+
+        self.assertEqual(response.status_code, 400, "status code is not 400")
+
+    def test_admin_log_in_waits_for_the_pool(self):
+
+        self.user.is_staff = True
+        self.user.save()
+        slots = threading.Semaphore(0)
+        threading.Timer(0.1, slots.release).start()
+        with mock.patch("users.passwords.slots", slots):
+            response = self.client.post(
+                "/admin/login/",
+                data={"username": "test", "password": self.PASSWORD},
+            )
+
+        self.assertEqual(response.status_code, 302, "status code is not 302")
+        self.assertNotIn("passwords.rejected", metrics.snapshot()["counters"])
+
+    def test_saturated_pool_is_throttled(self):
+
+        with mock.patch("users.passwords.slots", threading.Semaphore(0)):
+            response = self.log_in()
+
+        self.assertEqual(response.status_code, 429, "status code is not 429")
+        self.assertIn("Retry-After", response)
+        self.assertEqual(metrics.snapshot()["counters"]["passwords.rejected"], 1)
@@ -1,6 +1,6 @@
 from django.urls import path
 from rest_framework.authtoken.views import obtain_auth_token
-from . import views
+from . import oauth, views
 
 urlpatterns = [
     path("", views.Users.as_view()),
@@ -10,8 +10,8 @@ urlpatterns = [
     path("log-in", views.LogIn.as_view()),
     path("token-login", views.CustomAuthToken.as_view()),
     path("jwt-login", views.JWTLogIn.as_view()),
-    path("github", views.GithubLogIn.as_view()),
-    path("kakao", views.KakaoLogIn.as_view()),
+    path("github", oauth.github_log_in),
+    path("kakao", oauth.kakao_log_in),
     path("log-out", views.LogOut.as_view()),
     path("@<str:username>", views.PublicUser.as_view()),
     path("@<str:username>/reviews", views.PublicUserReviews.as_view()),
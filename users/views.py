@@ -1,7 +1,4 @@
-import jwt
-import requests
 from django.contrib.auth import authenticate, login, logout
-from django.conf import settings
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
@@ -9,9 +6,18 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ParseError, NotFound
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
-from . import serializers
+from . import passwords, serializers
 from .models import User
+from reviews.models import Review
 from reviews.serializers import ReviewSerializer
+from common.conditional import get_stamp
+from common.fast_serializers import compiled
+from common.pagination import KeysetPagination
+from config.authentication import (
+    create_token,
+    forget_user_tokens,
+    revoke_token,
+)
 
 
 class Me(APIView):
@@ -39,6 +45,7 @@ class Me(APIView):
 
 
 class Users(APIView):
+    @passwords.reject_when_full
     def post(self, request):
         password = request.data.get("password")
         if not password:
@@ -56,18 +63,29 @@ class Users(APIView):
 
 class PublicUser(APIView):
     def get(self, request, username):
+        stamp = get_stamp(
+            User.objects.filter(username=username),
+            ("username", "email", "avatar", "name", "is_host", "gender"),
+            {"reviews": (Review.objects.all(), "user")},
+        )
+        if stamp is None:
+            raise NotFound
+        response = stamp.not_modified(request)
+        if response is not None:
+            return response
         try:
             user = User.objects.get(username=username)
         except User.DoesNotExist:
             raise NotFound
         serializer = serializers.PublicUserSerializer(user)
-        return Response(serializer.data)
+        return stamp.apply(Response(serializer.data))
 
 
 class ChangePassword(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @passwords.reject_when_full
     def put(self, request):
         user = request.user
         old_password = request.data.get("old_password")
@@ -77,6 +95,7 @@ class ChangePassword(APIView):
         if user.check_password(old_password):
             user.set_password(new_password)
             user.save()
+            forget_user_tokens(user)
             return Response(status=status.HTTP_200_OK)
         else:
             raise ParseError
@@ -90,21 +109,18 @@ class PublicUserReviews(APIView):
             raise NotFound
 
     def get(self, request, username):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except:
-            page = 1
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
         user = self.get_object(username)
-        reviews = user.reviews.all()[start:end]
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
+        serializer = compiled(ReviewSerializer)
+        paginator = KeysetPagination()
+        reviews = paginator.paginate_queryset(
+            serializer.values(user.reviews.all(), "created_at"),
+            request,
+        )
+        return paginator.get_paginated_response(serializer.serialize(reviews))
 
 
 class LogIn(APIView):
+    @passwords.reject_when_full
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
@@ -134,11 +150,14 @@ class LogOut(APIView):
             request.user.auth_token.delete()
         except:
             pass
+        if isinstance(request.auth, dict) and "jti" in request.auth:
+            revoke_token(request.auth)
         logout(request)
         return Response({"ok": "bye!"})
 
 
 class JWTLogIn(APIView):
+    @passwords.reject_when_full
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
@@ -150,11 +169,7 @@ class JWTLogIn(APIView):
             password=password,
         )
         if user:
-            token = jwt.encode(
-                {"pk": user.pk},
-                settings.SECRET_KEY,
-                algorithm="HS256",
-            )
+            token = create_token(user)
             login(request, user)
             return Response({"token": token})
 
@@ -165,6 +180,7 @@ class JWTLogIn(APIView):
 
 
 class CustomAuthToken(ObtainAuthToken):
+    @passwords.reject_when_full
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -173,108 +189,8 @@ class CustomAuthToken(ObtainAuthToken):
         return Response({"token": token.key})
 
 
-class GithubLogIn(APIView):
-    def post(self, request):
-        try:
-            code = request.data.get("code")
-            client_id = "54c145a4cd5b954d7bc7"
-            access_token = requests.post(
-                f"https://github.com/login/oauth/access_token?code={code}&client_id={client_id}&client_secret={settings.GH_SECRET}",
-                headers={"Accept": "application/json"},
-            )
-            access_token = access_token.json().get("access_token")
-            user_data = requests.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            user_data = user_data.json()
-            user_emails = requests.get(
-                "https://api.github.com/user/emails",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            user_emails = user_emails.json()
-            try:
-                user = User.objects.get(email=user_emails[0]["email"])
-                login(request, user)
-                token, created = Token.objects.get_or_create(user=user)
-                return Response(
-                    {"token": token.key}, status=status.HTTP_200_OK
-                )
-            except User.DoesNotExist:
-                user = User.objects.create(
-                    username=user_data.get("login"),
-                    email=user_emails[0]["email"],
-                    name=user_data.get("name"),
-                    avatar=user_data.get("avatar_url"),
-                )
-                user.set_unusable_password()
-                user.save()
-                login(request, user)
-                token, created = Token.objects.get_or_create(user=user)
-                return Response(
-                    {"token": token.key}, status=status.HTTP_200_OK
-                )
-        except Exception:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-
-
-class KakaoLogIn(APIView):
-    def post(self, request):
-
-        try:
-            code = request.data.get("code")
-            access_token = requests.post(
-                "https://kauth.kakao.com/oauth/token",
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                data={
-                    "grant_type": "authorization_code",
-                    "client_id": "69972b9d88c49a0c80f5a89b99941eba",
-                    "redirect_uri": "https://airbnb-frontend-syyh.onrender.com/social/kakao",
-                    "code": code,
-                },
-            )
-            access_token = access_token.json().get("access_token")
-            user_data = requests.get(
-                "https://kapi.kakao.com/v2/user/me",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-type": "application/x-www-form-urlencoded;charset=utf-8",
-                },
-            )
-            user_data = user_data.json()
-            kakao_account = user_data.get("kakao_account")
-            profile = kakao_account.get("profile")
-            try:
-                user = User.objects.get(email=kakao_account.get("email"))
-                login(request, user)
-                token, created = Token.objects.get_or_create(user=user)
-                return Response(
-                    {"token": token.key}, status=status.HTTP_200_OK
-                )
-            except User.DoesNotExist:
-                user = User.objects.create(
-                    email=kakao_account.get("email"),
-                    username=profile.get("nickname"),
-                    name=profile.get("nickname"),
-                    avatar=profile.get("profile_image_url"),
-                )
-                user.set_unusable_password()
-                user.save()
-                token, created = Token.objects.get_or_create(user=user)
-                return Response(
-                    {"token": token.key}, status=status.HTTP_200_OK
-                )
-        except Exception:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-
-
 class SignUp(APIView):
+    @passwords.reject_when_full
     def post(self, request):
         name = request.data.get("name")
         email = request.data.get("email")
@@ -306,12 +222,11 @@ class SignUp(APIView):
         except User.DoesNotExist:
             pass
 
-        user = User.objects.create(
+        user = User(
             name=name,
             email=email,
             username=username,
         )
-
         user.set_password(password)
         user.save()
 
@@ -0,0 +1,27 @@
+from .models import Wishlist
+
+
+def get_liked_pks(request, field, column):
+    """Load what the user liked once per request instead of once per object"""
+    if not request.user.is_authenticated:
+        return set()
+    try:
+        liked = request._liked_pks
+    except AttributeError:
+        liked = request._liked_pks = {}
+    if field not in liked:
+        through = getattr(Wishlist, field).through
+        liked[field] = set(
+            through.objects.filter(
+                wishlist__user=request.user,
+            ).values_list(column, flat=True)
+        )
+    return liked[field]
+
+
+def liked_room_pks(request):
+    return get_liked_pks(request, "rooms", "room_id")
+
+
+def liked_experience_pks(request):
+    return get_liked_pks(request, "experiences", "experience_id")
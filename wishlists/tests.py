@@ -1,3 +1,66 @@
-from django.test import TestCase
+import datetime
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from experiences.models import Experience
+from rooms.models import Room
+from users.models import User
+from .models import Wishlist
 
-# Create your tests here.
+
+class TestWishlists(APITestCase):
+
+    URL = "/api/v1/wishlists/"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            username="test",
+        )
+        self.wishlist = Wishlist.objects.create(
+            name="Wishlist",
+            user=self.user,
+        )
+        self.client.force_login(self.user)
+
+    def add_listings(self, count):
+        for number in range(count):
+            room = Room.objects.create(
+                name=f"Room {number}",
+                price=100,
+                rooms=1,
+                toilets=1,
+                address="Address",
+                kind=Room.RoomKindChocies.ENTIRE_PLACE,
+                owner=self.user,
+            )
+            experience = Experience.objects.create(
+                name=f"Experience {number}",
+                host=self.user,
+                price=100,
+                address="Address",
+                start=datetime.time(10),
+                end=datetime.time(12),
+                description="Description",
+            )
+            self.wishlist.rooms.add(room)
+            self.wishlist.experiences.add(experience)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200, "status code is not 200")
+        return len(queries), response.json()
+
+    def test_like_state_is_loaded_once(self):
+
+        self.add_listings(1)
+        few_queries, _ = self.count_queries()
+
+        self.add_listings(4)
+        many_queries, data = self.count_queries()
+
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(len(data[0]["experiences"]), 5)
+        self.assertTrue(
+            all(experience["is_liked"] for experience in data[0]["experiences"])
+        )
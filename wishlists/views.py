@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -7,6 +8,16 @@ from .models import Wishlist
 from .serializers import WishlistSerializer
 from rooms.models import Room
 from experiences.models import Experience
+from common.streaming import StreamingJSONResponse, wants_stream
+
+WISHLIST_PREFETCH = (
+    "rooms__photos",
+    Prefetch(
+        "experiences",
+        queryset=Experience.objects.select_related("video"),
+    ),
+    "experiences__photos",
+)
 
 
 class Wishlists(APIView):
@@ -14,7 +25,15 @@ class Wishlists(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        all_wishlists = Wishlist.objects.filter(user=request.user)
+        all_wishlists = Wishlist.objects.filter(user=request.user).prefetch_related(
+            *WISHLIST_PREFETCH
+        )
+        if wants_stream(request):
+            return StreamingJSONResponse(
+                all_wishlists,
+                WishlistSerializer,
+                context={"request": request},
+            )
         serializer = WishlistSerializer(
             all_wishlists,
             many=True,
@@ -43,7 +62,12 @@ class WishlistDetail(APIView):
             raise NotFound
 
     def get(self, request, pk):
-        wishlist = self.get_object(pk, request.user)
+        try:
+            wishlist = Wishlist.objects.prefetch_related(*WISHLIST_PREFETCH).get(
+                pk=pk, user=request.user
+            )
+        except Wishlist.DoesNotExist:
+            raise NotFound
         serializer = WishlistSerializer(wishlist, context={"request": request})
         return Response(serializer.data)
 